@@ -0,0 +1,155 @@
+"""
+Article Store - Optional SQLite mirror of the news cache with secondary indexes
+(category, source, published time, canonical URL) for paged and filtered queries
+"""
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Off by default: the JSON snapshot stays the source of truth either way
+ARTICLE_STORE_ENABLED = os.getenv("ARTICLE_STORE_ENABLED", "false").lower() == "true"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    canonical_url TEXT,
+    source TEXT COLLATE NOCASE,
+    published_epoch REAL,
+    title TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (category, position)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_category_published ON articles (category, published_epoch);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_epoch);
+CREATE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles (canonical_url);
+CREATE TABLE IF NOT EXISTS categories (
+    category TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    article_count INTEGER NOT NULL,
+    synced_at TEXT
+);
+"""
+
+# Orderings accepted by query(): cache order, or newest published first (undated last)
+ORDERINGS = {
+    'position': "category, position",
+    'time': "published_epoch IS NULL, published_epoch DESC, category, position",
+}
+
+
+class ArticleStore:
+    """Articles of every category as rows in cache/articles.db.
+
+    sync() mirrors the cache's categories into the table, rewriting only the
+    categories whose content changed since the last sync. The database is in
+    WAL mode, so other workers can query while one of them writes.
+    """
+
+    def __init__(self, path: str, canonical: Callable[[str], Optional[str]]):
+        self.path = path
+        self._canonical = canonical
+        self._local = threading.local()  # one connection per thread
+        self._write_lock = threading.Lock()
+        self._schema_ready = False
+        self._last_synced = None
+        self._rewritten = 0
+        self._queries = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _content_hash(articles: List[Dict]) -> str:
+        payload = json.dumps(articles, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _rows(self, category: str, articles: List[Dict]):
+        for position, article in enumerate(articles):
+            published = article.get('published_epoch')
+            yield (category, position, self._canonical(article.get('link')), article.get('source'),
+                   published if isinstance(published, (int, float)) else None,
+                   article.get('title'), json.dumps(article, ensure_ascii=False, separators=(',', ':')))
+
+    def sync(self, categories: Dict[str, List[Dict]]) -> int:
+        """Mirror category -> articles into the table; returns how many categories were rewritten"""
+        hashes = {category: self._content_hash(articles) for category, articles in categories.items()}
+        conn = self._connect()
+        with self._write_lock, conn:
+            stored = {row['category']: row['content_hash']
+                      for row in conn.execute("SELECT category, content_hash FROM categories")}
+            changed = [category for category, content_hash in hashes.items() if stored.get(category) != content_hash]
+            removed = [category for category in stored if category not in categories]
+            now = datetime.now().isoformat()
+            for category in changed + removed:
+                conn.execute("DELETE FROM articles WHERE category = ?", (category,))
+            for category in removed:
+                conn.execute("DELETE FROM categories WHERE category = ?", (category,))
+            for category in changed:
+                conn.executemany("INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 self._rows(category, categories[category]))
+                conn.execute("INSERT OR REPLACE INTO categories VALUES (?, ?, ?, ?)",
+                             (category, hashes[category], len(categories[category]), now))
+        if changed or removed:
+            self._last_synced = now
+            self._rewritten += len(changed) + len(removed)
+            print(f"[Article Store] Synced {len(changed)} changed, {len(removed)} removed categories")
+        return len(changed) + len(removed)
+
+    def query(self, category: str = None, source: str = None, since: float = None, q: str = None,
+              order: str = 'position', limit: int = 100, offset: int = 0) -> Tuple[List[Dict], int]:
+        """(one page of matching articles, total number of matches)"""
+        clauses, params = [], []
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if since is not None:
+            clauses.append("published_epoch >= ?")
+            params.append(since)
+        if q:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            params.append('%' + q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM articles{where}", params).fetchone()[0]
+        rows = conn.execute(f"SELECT body FROM articles{where} ORDER BY {ORDERINGS.get(order, ORDERINGS['position'])} "
+                            f"LIMIT ? OFFSET ?", params + [limit, offset]).fetchall()
+        self._queries += 1
+        return [json.loads(row['body']) for row in rows], total
+
+    def get_stats(self) -> Dict:
+        try:
+            counts = {row['category']: row['article_count'] for row in
+                      self._connect().execute("SELECT category, article_count FROM categories")}
+            size = os.path.getsize(self.path)
+        except (sqlite3.Error, OSError) as e:
+            return {"path": self.path, "error": str(e)}
+        return {
+            "path": self.path,
+            "articles": sum(counts.values()),
+            "category_counts": counts,
+            "size_kb": round(size / 1024, 2),
+            "last_synced": self._last_synced,
+            "categories_rewritten": self._rewritten,
+            "queries": self._queries,
+        }
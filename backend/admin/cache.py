@@ -2,15 +2,57 @@
 News Cache System - Stores scraped articles in JSON and syncs with Supabase Storage
 """
 import os
+import copy
 import json
 import time
+import gzip
+import hashlib
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import threading
 
-# Local cache file path
+from .snapshot_store import SnapshotStore
+from .article_store import ArticleStore, ARTICLE_STORE_ENABLED
+
+# Local cache files: snapshots are written to CACHE_SNAPSHOT_FILE; CACHE_FILE
+# (plain JSON, shipped with the repo) is only read when no snapshot exists yet
 CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache')
 CACHE_FILE = os.path.join(CACHE_DIR, 'news_cache.json')
+CACHE_SNAPSHOT_FILE = os.path.join(CACHE_DIR, 'news_cache.snapshot')
+# SQLite mirror used for paged / filtered article queries (ARTICLE_STORE_ENABLED)
+ARTICLE_DB_FILE = os.path.join(CACHE_DIR, 'articles.db')
+
+# Seconds between checks for a snapshot published by another worker
+GENERATION_CHECK_INTERVAL = float(os.getenv("CACHE_GENERATION_CHECK_INTERVAL", "1"))
+
+# Cloud copy: one gzip shard per category under content-addressed names, plus
+# a small manifest (the only object ever overwritten) that workers read first.
+# CLOUD_CACHE_FILE is the single-blob layout of older versions, still readable.
+CLOUD_CACHE_FILE = "news_cache.json"
+CLOUD_MANIFEST_FILE = "news_manifest.json"
+CLOUD_SHARD_DIR = "shards"
+# Minimum seconds between manifest checks (explicit loads ignore it)
+MANIFEST_CHECK_INTERVAL = int(os.getenv("CLOUD_MANIFEST_CHECK_INTERVAL", "60"))
+
+# Incremental refresh: articles that drop out of their sources stay in the
+# category for this long (hours), filling slots the fresh scrape leaves empty
+RETENTION_HOURS = float(os.getenv("NEWS_RETENTION_HOURS", "24"))
+
+# Minutes before a category counts as stale; categories whose sources change
+# slowly wait longer (override with NEWS_CATEGORY_TTLS="github=360,career=120")
+DEFAULT_CATEGORY_TTL_MINUTES = 60
+CATEGORY_TTL_MINUTES = {
+    'github': 180,
+    **{cat.strip(): int(minutes) for cat, _, minutes in
+       (pair.partition('=') for pair in os.getenv("NEWS_CATEGORY_TTLS", "").split(',') if '=' in pair)},
+}
+
+# Already-resolved fields copied from the cached copy when a fresh one lacks them
+CARRY_OVER_FIELDS = ('image', 'description')
+
+# Query parameters that never change which article a link points to (plus any utm_*)
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref', 'cmpid', 'ocid', 'mc_cid', 'mc_eid'}
 
 # Cache structure
 DEFAULT_CACHE = {
@@ -18,6 +60,7 @@ DEFAULT_CACHE = {
     "last_refresh_duration": 0,
     "total_articles": 0,
     "feed_version": 1,
+    "category_meta": {},
     "categories": {
         "tech": [],
         "education": [],
@@ -35,6 +78,40 @@ DEFAULT_CACHE = {
     }
 }
 
+def canonical_link(link: str) -> Optional[str]:
+    """Normalized article URL (scheme/host case, www., fragment, tracking params, trailing /)"""
+    if not link or link == '#':
+        return None
+    try:
+        parts = urlsplit(link.strip())
+    except ValueError:
+        return link.strip()
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not (k.lower().startswith('utm_') or k.lower() in TRACKING_PARAMS)))
+    return urlunsplit(('https' if parts.scheme in ('http', 'https') else parts.scheme,
+                       host, parts.path.rstrip('/') or '/', query, ''))
+
+def is_not_found(error: Exception) -> bool:
+    """Storage error saying the object does not exist (anything else may be transient)"""
+    detail = error.args[0] if error.args else None
+    if isinstance(detail, dict):
+        return str(detail.get('statusCode')) == '404' or detail.get('error') == 'not_found' \
+            or 'not found' in str(detail.get('message', '')).lower()
+    return 'not found' in str(error).lower()
+
+def article_key(article: Dict) -> str:
+    """Stable identity of an article: its id, else its canonical link, else its title"""
+    if article.get('id'):
+        return f"id:{article['id']}"
+    link = canonical_link(article.get('link'))
+    if link:
+        return link
+    return f"title:{article.get('title', '').strip().lower()}"
+
+
 class NewsCache:
     _instance = None
     _lock = threading.Lock()
@@ -52,8 +129,22 @@ class NewsCache:
             return
         self._initialized = True
         self._cache = None
+        self._index = None  # canonical link -> cached article, across categories
+        self._data_lock = threading.RLock()
+        self._generation_checked_at = 0.0
+        # Unsaved changes, re-applied on top of whatever another worker published meanwhile
+        self._changed = set()  # categories replaced or merged
+        self._replaced = False  # whole cache replaced (clear)
+        self._version_bumps = 0
+        self._pending_refreshes = 0
+        self._duration_changed = False
+        self._store = SnapshotStore(CACHE_SNAPSHOT_FILE, legacy_path=CACHE_FILE)
+        self._articles = ArticleStore(ARTICLE_DB_FILE, canonical=canonical_link) if ARTICLE_STORE_ENABLED else None
         self._supabase = None
         self._bucket_name = "news-cache"
+        self._shard_hashes = {}  # category -> hash of the shard last uploaded or downloaded
+        self._cloud_manifest = None  # last manifest read or written
+        self._manifest_checked_at = 0.0
         self._ensure_cache_dir()
         self._load_cache()
     
@@ -63,31 +154,104 @@ class NewsCache:
             os.makedirs(CACHE_DIR)
     
     def _load_cache(self):
-        """Load cache from local file"""
+        """Load cache from the local snapshot (or the last good one)"""
         try:
-            if os.path.exists(CACHE_FILE):
-                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                    self._cache = json.load(f)
+            data = self._store.load()
+            if data is not None:
+                self._cache = data
+                self._index = None
                 print(f"[Cache] Loaded {self._cache.get('total_articles', 0)} articles from local cache")
+                self._sync_article_store()
             else:
-                self._cache = DEFAULT_CACHE.copy()
+                self._cache = copy.deepcopy(DEFAULT_CACHE)
                 self._cache['metadata']['created_at'] = datetime.now().isoformat()
                 self._save_local()
                 print("[Cache] Created new cache file")
         except Exception as e:
             print(f"[Cache] Error loading cache: {e}")
-            self._cache = DEFAULT_CACHE.copy()
+            self._cache = copy.deepcopy(DEFAULT_CACHE)
     
     def _save_local(self):
-        """Save cache to local file"""
+        """Save cache as a new local snapshot (atomic; the previous one is kept).
+        
+        Holds the snapshot's file lock from the generation check to the
+        rename: if another worker published since our last load, its snapshot
+        is loaded and only our unsaved changes are applied on top of it.
+        """
         try:
-            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self._cache, f, ensure_ascii=False, indent=2)
+            with self._data_lock, self._store.exclusive():
+                published = self._store.published_generation()
+                if published is not None and published != self._store.loaded_generation:
+                    latest = self._store.load()
+                    if latest is not None:
+                        self._cache = self._rebase(latest)
+                        self._index = None
+                self._store.save(self._cache)
+                self._changed = set()
+                self._replaced = False
+                self._version_bumps = 0
+                self._pending_refreshes = 0
+                self._duration_changed = False
+                self._sync_article_store()
             return True
         except Exception as e:
             print(f"[Cache] Error saving local cache: {e}")
             return False
     
+    def _rebase(self, latest: Dict) -> Dict:
+        """`latest` (another worker's snapshot) with this worker's unsaved changes applied"""
+        if self._replaced:
+            return self._cache
+        ours = self._cache
+        merged = latest
+        categories = merged.setdefault('categories', {})
+        category_meta = merged.setdefault('category_meta', {})
+        metadata = merged.setdefault('metadata', {})
+        for category in self._changed:
+            if category in ours.get('categories', {}):
+                categories[category] = ours['categories'][category]
+            else:
+                categories.pop(category, None)
+            if category in ours.get('category_meta', {}):
+                category_meta[category] = ours['category_meta'][category]
+            if category in ours.get('metadata', {}).get('last_merge', {}):
+                metadata.setdefault('last_merge', {})[category] = ours['metadata']['last_merge'][category]
+        merged['feed_version'] = max(merged.get('feed_version', 1) + self._version_bumps,
+                                     ours.get('feed_version', 1))
+        merged['last_updated'] = max(filter(None, (merged.get('last_updated'), ours.get('last_updated'))),
+                                     default=None)
+        if self._duration_changed:
+            merged['last_refresh_duration'] = ours.get('last_refresh_duration', 0)
+        metadata['refresh_count'] = metadata.get('refresh_count', 0) + self._pending_refreshes
+        merged['total_articles'] = sum(len(a) for a in categories.values())
+        return merged
+    
+    def _sync_article_store(self):
+        """Mirror the categories into the SQLite article store (only changed ones are rewritten)"""
+        if self._articles is None:
+            return
+        try:
+            with self._data_lock:
+                self._articles.sync(self._cache.get('categories', {}))
+        except Exception as e:
+            print(f"[Cache] Error syncing article store: {e}")
+    
+    def reload_if_changed(self) -> bool:
+        """Load the published snapshot if another worker has swapped in a new generation
+        (keeping this worker's unsaved changes on top of it)"""
+        self._generation_checked_at = time.time()
+        published = self._store.published_generation()
+        if published is None or published == self._store.loaded_generation:
+            return False
+        with self._data_lock:
+            data = self._store.load()
+            if data is None:
+                return False
+            self._cache = self._rebase(data)
+            self._index = None
+        print(f"[Cache] Reloaded {self._cache.get('total_articles', 0)} articles saved by another worker")
+        return True
+    
     def set_supabase(self, supabase_client):
         """Set the Supabase client for cloud sync"""
         self._supabase = supabase_client
@@ -101,62 +265,249 @@ class NewsCache:
         except Exception as e:
             print(f"[Cache] Note: Could not setup bucket (may already exist): {e}")
     
+    def _upload(self, path: str, file_bytes: bytes, content_type: str = "application/json"):
+        """Write one object in the bucket, replacing it in place if it exists"""
+        bucket = self._supabase.storage.from_(self._bucket_name)
+        options = {"content-type": content_type, "upsert": "true"}
+        try:
+            bucket.upload(path=path, file=file_bytes, file_options=options)
+        except Exception as e:
+            print(f"[Cache] Upload of {path} failed ({e}), trying update")
+            bucket.update(path=path, file=file_bytes, file_options=options)
+    
+    @staticmethod
+    def _shard_bytes(articles: List[Dict]) -> bytes:
+        return json.dumps(articles, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    
+    def _build_manifest(self, shards: Dict[str, Dict], category_meta: Dict[str, Dict],
+                        retired: List[str]) -> Dict:
+        """Small summary of the cloud copy: workers compare it before downloading shards"""
+        meta = {key: value for key, value in self._cache.items() if key != 'categories'}
+        meta['category_meta'] = category_meta
+        return {
+            "version": self._cache.get('feed_version', 1),
+            "refresh_count": self._cache.get('metadata', {}).get('refresh_count', 0),
+            "last_updated": self._cache.get('last_updated'),
+            "categories": {cat: category_meta.get(cat, {}).get('last_updated') for cat in shards},
+            "shards": shards,
+            "retired": retired,  # replaced shard objects, deleted on the next sync
+            "hash": hashlib.sha256(''.join(shards[cat]['hash'] for cat in sorted(shards)).encode()).hexdigest(),
+            "meta": meta,
+            "uploaded_at": datetime.now().isoformat(),
+        }
+    
     def sync_to_supabase(self) -> bool:
-        """Upload cache to Supabase storage"""
+        """Upload changed category shards to Supabase storage, then swap in the manifest.
+        
+        Shards are written under new content-addressed names and only the
+        manifest is replaced, so readers always see a complete cloud copy;
+        replaced shards are removed one sync later, so workers holding the
+        previous manifest can still read them.
+        """
         if not self._supabase:
             print("[Cache] Supabase client not set, skipping cloud sync")
             return False
         
         try:
-            cache_json = json.dumps(self._cache, ensure_ascii=False)
-            file_bytes = cache_json.encode('utf-8')
+            # Start from what is in the cloud now - another worker may have synced since
+            # (a manifest that cannot be read aborts the sync)
+            cloud = self._read_manifest(force=True) or {}
+            previous = cloud.get('shards', {})
+            cloud_meta = cloud.get('meta', {}).get('category_meta', {})
+            shards = {}
+            uploaded = []
+            with self._data_lock:
+                categories = dict(self._cache.get('categories', {}))
+                category_meta = {cat: dict(self._cache.get('category_meta', {}).get(cat, {}))
+                                 for cat in categories}
+            for category, articles in categories.items():
+                raw = self._shard_bytes(articles)
+                content_hash = hashlib.sha256(raw).hexdigest()
+                old = previous.get(category)
+                if old and old.get('hash') == content_hash:
+                    shards[category] = old
+                    continue
+                cloud_updated = (cloud.get('categories') or {}).get(category) or ''
+                if old and cloud_updated > (category_meta[category].get('last_updated') or ''):
+                    # Refreshed more recently by another worker - keep theirs
+                    shards[category] = old
+                    category_meta[category] = cloud_meta.get(category, {'last_updated': cloud_updated})
+                    continue
+                path = f"{CLOUD_SHARD_DIR}/{category}.{content_hash[:16]}.json.gz"
+                self._upload(path, gzip.compress(raw, compresslevel=6), content_type="application/gzip")
+                shards[category] = {"path": path, "hash": content_hash, "count": len(articles)}
+                uploaded.append(category)
             
-            # Try to remove existing file first, then upload fresh
-            try:
-                self._supabase.storage.from_(self._bucket_name).remove(["news_cache.json"])
-            except:
-                pass  # File might not exist
+            live = {shard['path'] for shard in shards.values()}
+            retired = [shard['path'] for shard in previous.values() if shard.get('path') not in live]
+            expired = [path for path in cloud.get('retired', []) if path not in live]
+            
+            manifest = self._build_manifest(shards, category_meta, retired)
+            # Never publish a lower feed_version than another instance already did
+            manifest['version'] = manifest['meta']['feed_version'] = max(manifest['version'], cloud.get('version', 1))
+            # Same shards can still come with a new feed_version (force-update) or metadata
+            if not uploaded and previous and set(previous) == set(shards) and cloud.get('legacy_removed') \
+                    and cloud.get('version') == manifest['version'] and cloud.get('meta') == manifest['meta']:
+                print("[Cache] Cloud copy already up to date")
+                return True
+            
+            # The single-blob copy of older versions is only a fallback for a missing
+            # manifest; once shards are published it would just be stale
+            legacy_removed = cloud.get('legacy_removed', False)
+            if not legacy_removed:
+                try:
+                    self._supabase.storage.from_(self._bucket_name).remove([CLOUD_CACHE_FILE])
+                    legacy_removed = True
+                except Exception as e:
+                    print(f"[Cache] Could not remove {CLOUD_CACHE_FILE}: {e}")
+            
+            manifest['legacy_removed'] = legacy_removed
+            self._upload(CLOUD_MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+            self._cloud_manifest = manifest
+            self._shard_hashes = {cat: shard['hash'] for cat, shard in shards.items()}
+            print(f"[Cache] Synced to Supabase storage ({len(uploaded)}/{len(shards)} shards uploaded)")
             
-            # Upload new file
-            self._supabase.storage.from_(self._bucket_name).upload(
-                path="news_cache.json",
-                file=file_bytes,
-                file_options={"content-type": "application/json"}
-            )
-            print("[Cache] Synced to Supabase storage")
+            # Shards retired by the previous sync are no longer referenced by any manifest
+            if expired:
+                try:
+                    self._supabase.storage.from_(self._bucket_name).remove(expired)
+                except Exception as e:
+                    print(f"[Cache] Could not remove old shards: {e}")
             return True
         except Exception as e:
             print(f"[Cache] Error syncing to Supabase: {e}")
-            # Try update as fallback
-            try:
-                self._supabase.storage.from_(self._bucket_name).update(
-                    path="news_cache.json",
-                    file=cache_json.encode('utf-8'),
-                    file_options={"content-type": "application/json"}
-                )
-                print("[Cache] Updated in Supabase storage")
-                return True
-            except Exception as e2:
-                print(f"[Cache] Update also failed: {e2}")
-                return False
+            return False
+    
+    def _read_manifest(self, force: bool) -> Optional[Dict]:
+        """Cloud manifest, re-read at most once per MANIFEST_CHECK_INTERVAL unless forced.
+        
+        None means the bucket has no manifest; any other download error is raised.
+        """
+        now = time.time()
+        if not force and now - self._manifest_checked_at < MANIFEST_CHECK_INTERVAL:
+            return self._cloud_manifest
+        self._manifest_checked_at = now
+        try:
+            data = self._supabase.storage.from_(self._bucket_name).download(CLOUD_MANIFEST_FILE)
+        except Exception as e:
+            if not is_not_found(e):
+                raise
+            print(f"[Cache] No cloud manifest: {e}")
+            self._cloud_manifest = None
+            return None
+        self._cloud_manifest = json.loads(data.decode('utf-8'))
+        return self._cloud_manifest
     
-    def sync_from_supabase(self) -> bool:
-        """Download cache from Supabase storage"""
+    def _wanted_shards(self, manifest: Dict, categories: Optional[List[str]], force: bool) -> List[str]:
+        """Categories whose cloud shard differs from ours and is newer (or all, when forced)"""
+        wanted = []
+        local_meta = self._cache.get('category_meta', {})
+        for category, shard in manifest.get('shards', {}).items():
+            if categories is not None and category not in categories:
+                continue
+            if shard.get('hash') == self._shard_hashes.get(category):
+                continue
+            cloud_updated = (manifest.get('categories') or {}).get(category)
+            local_updated = local_meta.get(category, {}).get('last_updated')
+            if force or not local_updated or (cloud_updated and cloud_updated > local_updated) \
+                    or not self._cache.get('categories', {}).get(category):
+                wanted.append(category)
+        return wanted
+    
+    def sync_from_supabase(self, force: bool = False, categories: List[str] = None) -> bool:
+        """Download the category shards that are newer in Supabase storage.
+        
+        Reads the manifest first (at most once per MANIFEST_CHECK_INTERVAL
+        unless `force`) and fetches only the shards of `categories` (default:
+        all) whose cloud copy is newer; a newer feed_version is taken over even
+        when no shard changed. Returns True when anything was loaded.
+        """
         if not self._supabase:
             return False
         
+        checked_before = self._manifest_checked_at
         try:
-            response = self._supabase.storage.from_(self._bucket_name).download("news_cache.json")
-            self._cache = json.loads(response.decode('utf-8'))
-            self._save_local()
-            print(f"[Cache] Loaded {self._cache.get('total_articles', 0)} articles from Supabase")
-            return True
+            manifest = self._read_manifest(force)
+        except Exception as e:
+            print(f"[Cache] Could not read cloud manifest, skipping sync: {e}")
+            return False
+        if manifest is None or 'shards' not in manifest:
+            if not force and checked_before == self._manifest_checked_at:
+                return False  # throttled
+            return self._load_legacy_blob()
+        
+        wanted = self._wanted_shards(manifest, categories, force)
+        cloud_version = manifest.get('version', 1)
+        newer_version = cloud_version > self._cache.get('feed_version', 1)
+        if not wanted and not newer_version:
+            return False
+        
+        bucket = self._supabase.storage.from_(self._bucket_name)
+        loaded = {}
+        for category in wanted:
+            shard = manifest['shards'][category]
+            try:
+                raw = gzip.decompress(bucket.download(shard['path']))
+                if hashlib.sha256(raw).hexdigest() != shard['hash']:
+                    print(f"[Cache] Shard {shard['path']} does not match the manifest, skipping")
+                    continue
+                loaded[category] = (json.loads(raw.decode('utf-8')), shard['hash'])
+            except Exception as e:
+                # Most likely replaced by a newer upload; the next check picks that up
+                print(f"[Cache] Could not load shard {category}: {e}")
+        if not loaded and not newer_version:
+            return False
+        
+        meta = manifest.get('meta', {})
+        with self._data_lock:
+            self._cache.setdefault('categories', {})
+            category_meta = self._cache.setdefault('category_meta', {})
+            for category, (articles, content_hash) in loaded.items():
+                self._cache['categories'][category] = articles
+                category_meta[category] = meta.get('category_meta', {}).get(category, {})
+                self._shard_hashes[category] = content_hash
+                self._changed.add(category)
+            self._cache['feed_version'] = max(self._cache.get('feed_version', 1), meta.get('feed_version', 1),
+                                              cloud_version)
+            self._cache['last_updated'] = max(filter(None, (self._cache.get('last_updated'),
+                                                            meta.get('last_updated'))), default=None)
+            self._cache['total_articles'] = sum(len(a) for a in self._cache['categories'].values())
+            self._index = None
+        self._save_local()
+        if loaded:
+            print(f"[Cache] Loaded {len(loaded)} shards from Supabase ({', '.join(loaded)})")
+        else:
+            print(f"[Cache] Took feed version {self._cache['feed_version']} from Supabase")
+        return True
+    
+    def _load_legacy_blob(self) -> bool:
+        """Load the single-file cache written by older versions (only if it is newer than ours)"""
+        try:
+            response = self._supabase.storage.from_(self._bucket_name).download(CLOUD_CACHE_FILE)
+            data = json.loads(response.decode('utf-8'))
         except Exception as e:
             print(f"[Cache] Could not load from Supabase: {e}")
             return False
+        if (data.get('last_updated') or '') <= (self._cache.get('last_updated') or ''):
+            print("[Cache] Legacy cloud cache is not newer than the local one, ignoring it")
+            return False
+        with self._data_lock:
+            self._cache = data
+            self._index = None
+            self._shard_hashes = {}
+            self._changed.update(data.get('categories', {}))
+        self._save_local()
+        print(f"[Cache] Loaded {self._cache.get('total_articles', 0)} articles from Supabase")
+        return True
+    
+    def _follow_published(self):
+        """Pick up another worker's refresh (a stat() at most every GENERATION_CHECK_INTERVAL)"""
+        if time.time() - self._generation_checked_at >= GENERATION_CHECK_INTERVAL:
+            self.reload_if_changed()
     
     def get_articles(self, category: str = None) -> List[Dict]:
         """Get articles from cache"""
+        self._follow_published()
         if category and category in self._cache.get('categories', {}):
             return self._cache['categories'][category]
         
@@ -166,24 +517,162 @@ class NewsCache:
             all_articles.extend(cat_articles)
         return all_articles
     
+    def query_articles(self, category: str = None, source: str = None, since: float = None,
+                       q: str = None, order: str = 'position', limit: int = 100,
+                       offset: int = 0) -> Tuple[List[Dict], int]:
+        """One page of cached articles matching the filters, plus the total match count.
+        
+        `source` matches case-insensitively, `since` is an epoch compared with
+        published_epoch, `q` is a substring of the title; `order` is 'position'
+        (cache order) or 'time' (newest first). Served by the SQLite article
+        store when enabled, else by scanning the in-memory categories.
+        """
+        self._follow_published()
+        if self._articles is not None:
+            try:
+                return self._articles.query(category, source, since, q, order, limit, offset)
+            except Exception as e:
+                print(f"[Cache] Article store query failed, scanning memory: {e}")
+        
+        categories = self._cache.get('categories', {})
+        names = [category] if category else list(categories)
+        source = source.lower() if source else None
+        q = q.lower() if q else None
+        matches = [a for name in names for a in categories.get(name, [])
+                   if (not source or (a.get('source') or '').lower() == source)
+                   and (since is None or (a.get('published_epoch') or 0) >= since)
+                   and (not q or q in (a.get('title') or '').lower())]
+        if order == 'time':
+            matches.sort(key=lambda a: a.get('published_epoch') or 0, reverse=True)
+        return matches[offset:offset + limit], len(matches)
+    
+    def get_categories(self) -> Dict[str, List[Dict]]:
+        """category -> cached articles"""
+        return dict(self._cache.get('categories', {}))
+    
     def update_category(self, category: str, articles: List[Dict]):
         """Update articles for a specific category"""
         if 'categories' not in self._cache:
             self._cache['categories'] = {}
         self._cache['categories'][category] = articles
+        self._index = None
+        self._touch_category(category)
         self._update_metadata()
     
+    def merge_category(self, category: str, articles: List[Dict], limit: int = None,
+                       sort: Callable[[List[Dict]], List[Dict]] = None) -> Dict:
+        """Merge a fresh scrape into a category instead of replacing it.
+        
+        Articles are matched to cached ones by article_key(); matches keep
+        their first_seen time and any resolved fields the fresh copy lacks.
+        The category holds at most `limit` articles (default: as many as the
+        scrape returned): fresh ones first, then cached articles missing from
+        the scrape that were seen within RETENTION_HOURS. The result is
+        ordered with `sort` (e.g. sort_articles) when given.
+        """
+        now = time.time()
+        with self._data_lock:
+            if 'categories' not in self._cache:
+                self._cache['categories'] = {}
+            cached = {article_key(a): a for a in self._cache['categories'].get(category, [])}
+            
+            fresh = []
+            seen = set()
+            for article in articles:
+                key = article_key(article)
+                if key in seen:
+                    continue
+                seen.add(key)
+                previous = cached.get(key)
+                if previous is None:
+                    article['first_seen'] = now
+                else:
+                    article['first_seen'] = previous.get('first_seen', now)
+                    for field in CARRY_OVER_FIELDS:
+                        if not article.get(field) and previous.get(field):
+                            article[field] = previous[field]
+                article['last_seen'] = now
+                fresh.append(article)
+            
+            limit = len(fresh) if limit is None else limit
+            fresh = fresh[:limit]
+            new = sum(1 for a in fresh if article_key(a) not in cached)
+            carried = len(fresh) - new
+            
+            # Keep articles that dropped out of the sources until they age out
+            cutoff = now - RETENTION_HOURS * 3600
+            retained = [a for key, a in cached.items()
+                        if key not in seen and a.get('last_seen', a.get('first_seen', 0)) >= cutoff]
+            retained.sort(key=lambda a: a.get('last_seen', 0), reverse=True)
+            retained = retained[:max(limit - len(fresh), 0)]
+            kept = fresh + retained
+            if sort:
+                kept = sort(kept)
+            retained_count = len(retained)
+            
+            self._cache['categories'][category] = kept
+            self._index = None
+            self._touch_category(category)
+            self._update_metadata()
+            
+            result = {
+                "new": new,
+                "carried_over": carried,
+                "retained": retained_count,
+                "dropped": len(cached) - carried - retained_count,
+                "total": len(kept),
+                "merged_at": datetime.now().isoformat(),
+            }
+            self._cache.setdefault('metadata', {}).setdefault('last_merge', {})[category] = result
+        print(f"[Cache] Merged {category}: {new} new, {carried} carried over, "
+              f"{result['retained']} retained, {result['dropped']} dropped")
+        return result
+    
+    def find_article(self, link: str) -> Optional[Dict]:
+        """Cached article (any category) for a link, so scrapers can skip re-enriching it"""
+        key = canonical_link(link)
+        if not key:
+            return None
+        index = self._index
+        if index is None:
+            with self._data_lock:
+                index = {}
+                for cat_articles in self._cache.get('categories', {}).values():
+                    for article in cat_articles:
+                        link = canonical_link(article.get('link'))
+                        if link:
+                            index.setdefault(link, article)
+                self._index = index
+        return index.get(key)
+    
     def update_all(self, categories_data: Dict[str, List[Dict]]):
         """Update all categories at once"""
+        self._changed.update(self._cache.get('categories', {}))
         self._cache['categories'] = categories_data
+        self._index = None
+        for category in categories_data:
+            self._touch_category(category)
         self._update_metadata()
     
+    def _touch_category(self, category: str):
+        """Mark one category as just refreshed"""
+        category_meta = self._cache.setdefault('category_meta', {})
+        if not category_meta and self._cache.get('last_updated'):
+            # Cache saved before per-category tracking: the old global time applies to every category
+            for cat in self._cache.get('categories', {}):
+                category_meta[cat] = {'last_updated': self._cache['last_updated']}
+        meta = category_meta.setdefault(category, {})
+        meta['last_updated'] = datetime.now().isoformat()
+        self._changed.add(category)
+        meta['article_count'] = len(self._cache['categories'].get(category, []))
+    
     def _update_metadata(self):
         """Update cache metadata"""
         total = sum(len(articles) for articles in self._cache.get('categories', {}).values())
         self._cache['total_articles'] = total
         self._cache['last_updated'] = datetime.now().isoformat()
         self._cache['metadata']['refresh_count'] = self._cache['metadata'].get('refresh_count', 0) + 1
+        self._pending_refreshes += 1
     
     def save(self, sync_cloud: bool = True):
         """Save cache locally and optionally to cloud"""
@@ -197,22 +686,74 @@ class NewsCache:
             cat: len(articles) 
             for cat, articles in self._cache.get('categories', {}).items()
         }
+        category_meta = self._cache.get('category_meta', {})
+        categories = {}
+        for cat in self._cache.get('categories', {}):
+            age = self.category_age_minutes(cat)
+            categories[cat] = {
+                "articles": category_counts[cat],
+                "last_updated": category_meta.get(cat, {}).get('last_updated'),
+                "age_minutes": round(age, 1) if age is not None else None,
+                "ttl_minutes": self.category_ttl(cat),
+                "stale": self.is_stale(category=cat),
+                "refresh_duration": category_meta.get(cat, {}).get('refresh_duration'),
+            }
         return {
             "last_updated": self._cache.get('last_updated'),
             "last_refresh_duration": self._cache.get('last_refresh_duration', 0),
             "total_articles": self._cache.get('total_articles', 0),
             "category_counts": category_counts,
+            "categories": categories,
+            "stale_categories": [cat for cat, info in categories.items() if info["stale"]],
             "metadata": self._cache.get('metadata', {}),
-            "cache_file": CACHE_FILE,
-            "cache_size_kb": round(os.path.getsize(CACHE_FILE) / 1024, 2) if os.path.exists(CACHE_FILE) else 0
+            "cache_file": self._store.path,
+            "cache_size_kb": round(self._store.size() / 1024, 2),
+            "snapshot": self._store.get_stats(),
+            "article_store": self._articles.get_stats() if self._articles is not None else None
         }
     
-    def set_refresh_duration(self, duration: float):
-        """Set the last refresh duration"""
-        self._cache['last_refresh_duration'] = round(duration, 2)
+    def set_refresh_duration(self, duration: float, category: str = None):
+        """Set the last refresh duration (of the whole refresh, or of one category)"""
+        if category:
+            meta = self._cache.setdefault('category_meta', {}).setdefault(category, {})
+            meta['refresh_duration'] = round(duration, 2)
+            self._changed.add(category)
+        else:
+            self._cache['last_refresh_duration'] = round(duration, 2)
+            self._duration_changed = True
+    
+    def category_ttl(self, category: str) -> int:
+        """Minutes a category stays fresh"""
+        return CATEGORY_TTL_MINUTES.get(category, DEFAULT_CATEGORY_TTL_MINUTES)
+    
+    def category_age_minutes(self, category: str) -> Optional[float]:
+        """Minutes since a category was refreshed (caches saved before per-category
+        tracking fall back to the global last_updated)"""
+        category_meta = self._cache.get('category_meta') or {}
+        if category_meta:
+            last_updated = category_meta.get(category, {}).get('last_updated')
+        else:
+            last_updated = self._cache.get('last_updated')
+        if not last_updated:
+            return None
+        try:
+            return (datetime.now() - datetime.fromisoformat(last_updated)).total_seconds() / 60
+        except ValueError:
+            return None
     
-    def is_stale(self, max_age_minutes: int = 30) -> bool:
-        """Check if cache is stale"""
+    def is_stale(self, max_age_minutes: int = None, category: str = None) -> bool:
+        """Check if the cache (or one category) is stale.
+        
+        For a category the default max age is its TTL, for the whole cache 30 minutes.
+        """
+        if category:
+            age = self.category_age_minutes(category)
+            if max_age_minutes is None:
+                max_age_minutes = self.category_ttl(category)
+            return age is None or age > max_age_minutes
+        
+        if max_age_minutes is None:
+            max_age_minutes = 30
         last_updated = self._cache.get('last_updated')
         if not last_updated:
             return True
@@ -224,19 +765,27 @@ class NewsCache:
         except:
             return True
     
+    def stale_categories(self) -> List[str]:
+        """Categories past their TTL, for refresh scheduling"""
+        return [cat for cat in self._cache.get('categories', {}) if self.is_stale(category=cat)]
+    
     def clear(self):
         """Clear all cached articles"""
-        self._cache = DEFAULT_CACHE.copy()
+        self._cache = copy.deepcopy(DEFAULT_CACHE)
         self._cache['metadata']['created_at'] = datetime.now().isoformat()
+        self._index = None
+        self._replaced = True
         self._save_local()
 
     def increment_version(self):
         """Increment the feed version to force client refresh"""
         self._cache['feed_version'] = self._cache.get('feed_version', 1) + 1
+        self._version_bumps += 1
         self._save_local()
     
     def get_version(self) -> int:
         """Get current feed version"""
+        self._follow_published()
         return self._cache.get('feed_version', 1)
 
 
@@ -15,6 +15,9 @@ admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 # Simple admin key authentication (in production, use proper auth)
 ADMIN_KEY = os.getenv("ADMIN_API_KEY", "123456")
 
+# Hard limit for a whole admin refresh (seconds); categories not reached keep their cached articles
+REFRESH_DEADLINE = int(os.getenv("REFRESH_DEADLINE", "120"))
+
 # Admin settings (can be controlled via admin panel)
 _settings = {
     "playwright_enabled": True,  # Default: enabled
@@ -163,6 +166,11 @@ def set_source_priority():
         return jsonify({"error": "source_priority must be a list"}), 400
     
     _settings["source_priority"] = priority
+    
+    # Rebuild the compiled source -> rank index used by sort_articles
+    from news.ranking import source_ranker
+    source_ranker.set_priority(priority)
+    
     return jsonify({
         "success": True,
         "source_priority": priority,
@@ -187,14 +195,27 @@ def admin_login():
 @require_admin
 def get_stats():
     """Get system statistics"""
+    from news.feed_store import feed_store
+    from news.fetch_engine import fetch_engine
+    from news.image_resolver import image_resolver
+    from news.source_health import source_health
+    from news.scraper_client import get_availability, og_image_client
+    from news.single_flight import single_flight
     cache_stats = news_cache.get_stats()
     
     return jsonify({
         "cache": cache_stats,
+        "feeds": feed_store.get_stats(),
+        "fetch_engine": fetch_engine.stats(),
+        "images": image_resolver.get_stats(),
+        "sources": source_health.get_stats(),
+        "scraper_service": {**get_availability(), "og_images": og_image_client.get_stats()},
+        "single_flight": single_flight.get_stats(),
         "refresh_status": _refresh_status,
         "system": {
             "timestamp": datetime.now().isoformat(),
-            "cache_stale": news_cache.is_stale()
+            "cache_stale": news_cache.is_stale(),
+            "stale_categories": news_cache.stale_categories()
         }
     })
 
@@ -207,17 +228,29 @@ def get_cache_stats():
 @admin_bp.route('/cache/articles', methods=['GET'])
 @require_admin
 def get_cached_articles():
-    """Get all cached articles with optional category filter"""
+    """Get one page of cached articles, optionally filtered by category, source,
+    publish time (since = epoch seconds) and title text (q)"""
     category = request.args.get('category')
-    limit = request.args.get('limit', type=int, default=100)
+    limit = max(1, min(request.args.get('limit', type=int, default=100), 500))
+    offset = max(0, request.args.get('offset', type=int, default=0))
     
-    articles = news_cache.get_articles(category)
+    articles, total = news_cache.query_articles(
+        category=category,
+        source=request.args.get('source'),
+        since=request.args.get('since', type=float),
+        q=request.args.get('q'),
+        order=request.args.get('order', 'position'),
+        limit=limit,
+        offset=offset,
+    )
     
     return jsonify({
         "category": category or "all",
         "count": len(articles),
-        "articles": articles[:limit],
-        "total_available": len(articles)
+        "articles": articles,
+        "offset": offset,
+        "limit": limit,
+        "total_available": total
     })
 
 @admin_bp.route('/cache/clear', methods=['POST'])
@@ -248,6 +281,8 @@ def refresh_news():
     data = request.get_json() or {}
     sync_cloud = data.get('sync_cloud', True)
     categories = data.get('categories', None)  # None = all categories
+    full_refresh = data.get('mode') == 'full'  # "incremental" (default) merges into the cache
+    only_stale = data.get('only_stale', False)  # skip categories still within their TTL
     
     def run_refresh():
         global _refresh_status
@@ -256,7 +291,8 @@ def refresh_news():
             "started_at": datetime.now().isoformat(),
             "progress": 0,
             "current_task": "Initializing...",
-            "last_error": None
+            "last_error": None,
+            "cut_off": []
         }
         
         start_time = time.time()
@@ -266,8 +302,9 @@ def refresh_news():
             from news.scraper import (
                 get_all_tech_news, get_all_education_news, get_career_news,
                 get_ai_ml_news, get_startup_news, get_developer_content,
-                scrape_github_trending, get_general_trends
+                scrape_github_trending, get_general_trends, dedup_across_cache, sort_articles
             )
+            from news.fetch_engine import fetch_engine
             
             scrapers = {
                 'tech': ('Technology', get_all_tech_news),
@@ -283,25 +320,49 @@ def refresh_news():
             # Filter categories if specified
             if categories:
                 scrapers = {k: v for k, v in scrapers.items() if k in categories}
+            if only_stale:
+                scrapers = {k: v for k, v in scrapers.items() if news_cache.is_stale(category=k)}
+                print(f"[Admin] Stale categories to refresh: {list(scrapers) or 'none'}")
             
             total = len(scrapers)
             completed = 0
             
-            for cat_key, (cat_name, scraper_func) in scrapers.items():
-                try:
-                    _refresh_status["current_task"] = f"Scraping {cat_name}..."
-                    print(f"[Admin] Refreshing {cat_name}...")
+            # One refresh cycle: sources shared by several categories are fetched once,
+            # and the whole refresh is bounded by REFRESH_DEADLINE
+            with fetch_engine.refresh_cycle(), fetch_engine.deadline(REFRESH_DEADLINE):
+                for cat_key, (cat_name, scraper_func) in scrapers.items():
+                    try:
+                        if fetch_engine.time_left() <= 0:
+                            print(f"[Admin] Refresh deadline reached, skipping {cat_name}")
+                            _refresh_status["cut_off"].append(cat_key)
+                            continue
+                        
+                        _refresh_status["current_task"] = f"Scraping {cat_name}..."
+                        print(f"[Admin] Refreshing {cat_name}...")
                     
-                    articles = scraper_func()
-                    news_cache.update_category(cat_key, articles)
+                        category_start = time.time()
+                        articles = scraper_func()
+                        if not articles:
+                            # Nothing came back in time - keep what the cache already has
+                            print(f"[Admin] {cat_name}: no articles, keeping cached ones")
+                            _refresh_status["cut_off"].append(cat_key)
+                            continue
+                        articles = dedup_across_cache(cat_key, articles)
+                        if full_refresh:
+                            news_cache.update_category(cat_key, articles)
+                            print(f"[Admin] {cat_name}: {len(articles)} articles")
+                        else:
+                            merge = news_cache.merge_category(cat_key, articles, limit=get_articles_limit(),
+                                                              sort=sort_articles)
+                            print(f"[Admin] {cat_name}: {len(articles)} articles ({merge['new']} new)")
+                        news_cache.set_refresh_duration(time.time() - category_start, category=cat_key)
                     
-                    completed += 1
-                    _refresh_status["progress"] = int((completed / total) * 100)
-                    print(f"[Admin] {cat_name}: {len(articles)} articles")
+                        completed += 1
+                        _refresh_status["progress"] = int((completed / total) * 100)
                     
-                except Exception as e:
-                    print(f"[Admin] Error scraping {cat_name}: {e}")
-                    _refresh_status["last_error"] = f"Error in {cat_name}: {str(e)}"
+                    except Exception as e:
+                        print(f"[Admin] Error scraping {cat_name}: {e}")
+                        _refresh_status["last_error"] = f"Error in {cat_name}: {str(e)}"
             
             # Save cache
             _refresh_status["current_task"] = "Saving cache..."
@@ -365,7 +426,7 @@ def sync_to_cloud():
 @require_admin
 def load_from_cloud():
     """Load cache from Supabase"""
-    success = news_cache.sync_from_supabase()
+    success = news_cache.sync_from_supabase(force=True)
     return jsonify({
         "success": success,
         "message": "Loaded from cloud" if success else "Load failed",
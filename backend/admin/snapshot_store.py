@@ -0,0 +1,218 @@
+"""
+Snapshot Store - Atomic, checksummed local snapshots of the news cache
+(compact JSON, optionally gzip-compressed) that keep the previous good generation.
+Every worker maps the published snapshot read-only and spots a new generation
+with a stat() + header read
+"""
+import os
+import gzip
+import json
+import mmap
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: saves are only serialized within the process
+    fcntl = None
+
+# Header line in front of every snapshot: magic, generation, sha256 of the payload, gzip flag
+MAGIC = b'NCS1'
+
+# Compress snapshots on disk (smaller files, a little CPU per save/load)
+COMPRESS = os.getenv("LOCAL_CACHE_COMPRESS", "false").lower() == "true"
+
+
+class SnapshotError(Exception):
+    """A snapshot file is missing, truncated or fails its checksum"""
+
+
+class SnapshotStore:
+    """Writes a dict as a snapshot next to `path` via temp file + atomic rename.
+
+    The snapshot being replaced is kept as `<path>.prev`; load() falls back
+    to it (and then to `legacy_path`, a plain JSON file from older
+    versions) when the current one is damaged.
+    """
+
+    def __init__(self, path: str, legacy_path: str = None, compress: bool = COMPRESS):
+        self.path = path
+        self.prev_path = f"{path}.prev"
+        self.lock_path = f"{path}.lock"
+        self._legacy_path = legacy_path
+        self._compress = compress
+        self._lock = threading.Lock()
+        self._generation = 0        # highest generation seen (numbering for the next save)
+        self.loaded_generation = 0  # generation of the data last loaded or saved by this process
+        self._map = None            # read-only mmap of the published snapshot
+        self._map_key = None        # (inode, mtime) of the mapped file
+        self._map_generation = None
+        self._last_saved = None
+        self._last_loaded_from = None
+        self._recoveries = 0
+
+    @staticmethod
+    def _header(buf, path: str) -> Tuple[int, str, bool, int]:
+        """(generation, checksum, compressed, payload offset) from the first line"""
+        end = buf.find(b'\n')
+        parts = buf[:end].split() if end > 0 else []
+        if len(parts) != 4 or parts[0] != MAGIC:
+            raise SnapshotError(f"{path}: bad header")
+        return int(parts[1]), parts[2].decode(), parts[3] == b'1', end + 1
+
+    @classmethod
+    def _read(cls, path: str, parse: bool = True) -> Tuple[int, Optional[Dict]]:
+        """Verify and parse a snapshot, reading it through a read-only mapping
+        (with parse=False only the header and checksum are checked)"""
+        try:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    raise SnapshotError(f"{path}: empty")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    generation, checksum, compressed, offset = cls._header(mapped, path)
+                    with memoryview(mapped) as view:
+                        payload = view[offset:]
+                        try:
+                            if hashlib.sha256(payload).hexdigest() != checksum:
+                                raise SnapshotError(f"{path}: checksum mismatch (truncated or corrupt)")
+                            if not parse:
+                                return generation, None
+                            raw = gzip.decompress(payload) if compressed else payload.tobytes()
+                        finally:
+                            payload.release()
+        except OSError as e:
+            raise SnapshotError(f"{path}: {e}")
+        return generation, json.loads(raw.decode('utf-8'))
+
+    def _is_intact(self, path: str) -> bool:
+        """Header and checksum hold (the payload is not decompressed or parsed)"""
+        try:
+            self._read(path, parse=False)
+            return True
+        except (SnapshotError, ValueError):
+            return False
+
+    def load(self) -> Optional[Dict]:
+        """Newest intact snapshot (current, then previous generation, then legacy JSON)"""
+        with self._lock:
+            for path in (self.path, self.prev_path):
+                if not os.path.exists(path):
+                    continue
+                try:
+                    generation, data = self._read(path)
+                except (SnapshotError, ValueError) as e:
+                    print(f"[Snapshot] Skipping damaged snapshot: {e}")
+                    continue
+                if path == self.prev_path:
+                    self._recoveries += 1
+                    print(f"[Snapshot] Recovered generation {generation} from {path}")
+                self._generation = max(self._generation, generation)
+                self.loaded_generation = generation
+                self._last_loaded_from = path
+                return data
+
+            if self._legacy_path and os.path.exists(self._legacy_path):
+                try:
+                    with open(self._legacy_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    self._last_loaded_from = self._legacy_path
+                    return data
+                except ValueError as e:
+                    print(f"[Snapshot] Legacy cache file unreadable: {e}")
+            return None
+
+    def save(self, data: Dict) -> int:
+        """Write a new generation atomically; returns its number"""
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if self._compress:
+            payload = gzip.compress(payload, compresslevel=6)
+
+        with self._lock:
+            try:
+                with open(self.path, 'rb') as f:
+                    current = int(f.readline().split()[1])
+            except (OSError, IndexError, ValueError):
+                current = 0
+            generation = max(self._generation, current) + 1
+            header = b'%s %d %s %d\n' % (MAGIC, generation, hashlib.sha256(payload).hexdigest().encode(),
+                                         1 if self._compress else 0)
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(header)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            # Keep the current snapshot as the last good generation (a damaged one is just replaced)
+            if os.path.exists(self.path) and self._is_intact(self.path):
+                os.replace(self.path, self.prev_path)
+            os.replace(tmp_path, self.path)
+
+            self._generation = generation
+            self.loaded_generation = generation
+            self._last_saved = datetime.now().isoformat()
+            return generation
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the cross-process write lock (`<path>.lock`) so a worker can
+        reload the latest generation and save on top of it without another
+        worker publishing in between"""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def published_generation(self) -> Optional[int]:
+        """Generation of the snapshot currently on disk (None if there is none).
+
+        Costs a stat() per call; the file is only (re)mapped and its header
+        read when a new snapshot has been swapped in.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns)
+        with self._lock:
+            if key != self._map_key:
+                if self._map is not None:
+                    self._map.close()
+                    self._map = None
+                self._map_key = key
+                self._map_generation = None
+                try:
+                    with open(self.path, 'rb') as f:
+                        self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._map_generation = self._header(self._map, self.path)[0]
+                except (OSError, ValueError, SnapshotError) as e:
+                    print(f"[Snapshot] Could not map {self.path}: {e}")
+            return self._map_generation
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def get_stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "generation": self.loaded_generation,
+            "published_generation": self._map_generation,
+            "compressed": self._compress,
+            "size_kb": round(self.size() / 1024, 2),
+            "last_saved": self._last_saved,
+            "loaded_from": self._last_loaded_from,
+            "recoveries": self._recoveries,
+        }
@@ -55,7 +55,7 @@ else:
 # --- SETUP 4: FLASK ---
 app = Flask(__name__)
 app.url_map.strict_slashes = False  # Allow URLs with or without trailing slashes
-CORS(app)
+CORS(app, expose_headers=["X-Next-Cursor"])  # pagination cursor of /api/trends responses
 
 # Register blueprints
 app.register_blueprint(news_bp)
@@ -0,0 +1,169 @@
+"""
+Dedup - Near-duplicate headline detection with MinHash signatures and an LSH
+index, so reworded / syndicated copies of a story are dropped in one pass
+"""
+import os
+import re
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Signature length and banding: 16 bands x 4 rows puts the LSH threshold near
+# a Jaccard similarity of 0.5; candidates are then checked against SIMILARITY
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.6"))
+
+# One changed word is a different story in a short headline ("Sensex falls /
+# rises 300 points"), so titles with fewer than SHORT_TITLE_TOKENS content words
+# need SHORT_SIMILARITY, and ones below MIN_TOKENS only match identical titles
+SHORT_TITLE_TOKENS = 6
+SHORT_SIMILARITY = 0.8
+MIN_TOKENS = 3
+
+# Also drop articles already cached under another category
+DEDUP_ACROSS_CATEGORIES = os.getenv("DEDUP_ACROSS_CATEGORIES", "false").lower() == "true"
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def _permutations(n: int) -> List[Tuple[int, int]]:
+    """Fixed (a, b) pairs for the hash family, so signatures are stable across processes"""
+    perms = []
+    for i in range(n):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'big') % _PRIME or 1
+        b = int.from_bytes(digest[8:], 'big') % _PRIME
+        perms.append((a, b))
+    return perms
+
+_PERMS = _permutations(NUM_PERM)
+
+# Google News titles end in " - Publisher"; the publisher is not part of the story
+_PUBLISHER_SUFFIX_RE = re.compile(r'\s+[-|–—]\s+[^-|–—]{1,40}$')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have how in into is it its of on or that the this '
+    'to was were what when who why will with new news latest says after over'.split()
+)
+
+
+def title_tokens(title: str) -> frozenset:
+    """Content words of a headline (publisher suffix, stop words and plural s removed)"""
+    title = _PUBLISHER_SUFFIX_RE.sub('', title or '').lower()
+    tokens = set()
+    for word in _WORD_RE.findall(title):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.add(word)
+    return frozenset(tokens)
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), 'big')
+
+@lru_cache(maxsize=4096)
+def signature(tokens: frozenset) -> Tuple[int, ...]:
+    """MinHash signature of a token set"""
+    if not tokens:
+        return ()
+    hashes = [_token_hash(token) for token in tokens]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in _PERMS)
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def required_similarity(a: frozenset, b: frozenset, similarity: float = SIMILARITY) -> float:
+    """Jaccard similarity two headlines need to count as the same story"""
+    shorter = min(len(a), len(b))
+    if shorter < MIN_TOKENS:
+        return 1.0
+    if shorter < SHORT_TITLE_TOKENS:
+        return max(similarity, SHORT_SIMILARITY)
+    return similarity
+
+
+class LSHIndex:
+    """Banded MinHash index: add() headlines, find() the first near-duplicate"""
+
+    def __init__(self, similarity: float = SIMILARITY):
+        self._similarity = similarity
+        self._buckets = {}  # (band, rows) -> [item ids]
+        self._tokens = {}   # item id -> token set
+
+    def __len__(self):
+        return len(self._tokens)
+
+    @staticmethod
+    def _bands(sig: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(BANDS):
+            yield band, sig[band * ROWS:(band + 1) * ROWS]
+
+    def find(self, tokens: frozenset) -> Optional[object]:
+        """Id of an indexed item at least `similarity` alike, or None"""
+        sig = signature(tokens)
+        if not sig:
+            return None
+        checked = set()
+        for key in self._bands(sig):
+            for item in self._buckets.get(key, ()):
+                if item in checked:
+                    continue
+                checked.add(item)
+                other = self._tokens[item]
+                if jaccard(tokens, other) >= required_similarity(tokens, other, self._similarity):
+                    return item
+        return None
+
+    def add(self, item, tokens: frozenset):
+        sig = signature(tokens)
+        if not sig:
+            return
+        self._tokens[item] = tokens
+        for key in self._bands(sig):
+            self._buckets.setdefault(key, []).append(item)
+
+
+def dedup_articles(articles: List[Dict], index: LSHIndex = None) -> List[Dict]:
+    """Articles without near-duplicate headlines, first occurrence kept.
+
+    Pass an `index` pre-filled with other articles (e.g. other categories)
+    to drop those too. A kept article takes the image of a dropped copy if
+    it has none of its own.
+    
+    Short headlines that differ in a single word are different stories:
+    
+    >>> titles = lambda articles: [a['title'] for a in articles]
+    >>> titles(dedup_articles([{'title': 'Sensex falls 300 points'}, {'title': 'Sensex rises 300 points'}]))
+    ['Sensex falls 300 points', 'Sensex rises 300 points']
+    >>> titles(dedup_articles([{'title': 'Top 10 JavaScript tips'}, {'title': 'Top 10 Python tips'}]))
+    ['Top 10 JavaScript tips', 'Top 10 Python tips']
+    >>> titles(dedup_articles([{'title': 'OpenAI launches GPT-5 for all ChatGPT users - The Verge'},
+    ...                        {'title': 'OpenAI launches GPT-5 for all ChatGPT users today - Reuters'}]))
+    ['OpenAI launches GPT-5 for all ChatGPT users - The Verge']
+    """
+    index = index if index is not None else LSHIndex()
+    unique = []
+    for article in articles:
+        tokens = title_tokens(article.get('title', ''))
+        match = index.find(tokens)
+        if match is None:
+            index.add(len(unique), tokens)
+            unique.append(article)
+            continue
+        if isinstance(match, int):  # a copy kept in this call, not a pre-indexed one
+            kept = unique[match]
+            if not kept.get('image') and article.get('image'):
+                kept['image'] = article['image']
+    return unique
+
+def index_articles(articles: Iterable[Dict]) -> LSHIndex:
+    """Index of existing articles for dedup_articles() to check against"""
+    index = LSHIndex()
+    for position, article in enumerate(articles):
+        index.add(('seen', position), title_tokens(article.get('title', '')))
+    return index
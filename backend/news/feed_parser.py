@@ -0,0 +1,222 @@
+"""
+Feed Parser - Turns RSS / Atom feeds (and the GitHub Trending page) into
+article dicts in a single lxml pass, without building a BeautifulSoup tree
+"""
+import io
+import re
+import html
+from typing import Dict, Iterator, List, Optional
+
+import lxml.html
+from lxml import etree
+
+from .ranking import parse_published
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+RSS1_NS = 'http://purl.org/rss/1.0/'
+MEDIA_NS = 'http://search.yahoo.com/mrss/'
+CONTENT_NS = 'http://purl.org/rss/1.0/modules/content/'
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+
+# Entry elements for RSS 2.0, Atom and RSS 1.0 (RDF) feeds
+ENTRY_TAGS = ('item', f'{{{ATOM_NS}}}entry', f'{{{RSS1_NS}}}item')
+
+# Child elements read into an entry, by local name (un-namespaced, Atom or RSS 1.0)...
+_CORE_FIELDS = {
+    'title': 'title',
+    'link': 'link',
+    'pubDate': 'published',
+    'published': 'published',
+    'updated': 'updated',
+    'description': 'description',
+    'summary': 'description',
+    'content': 'content',
+    'source': 'source',
+    'author': 'author',
+    'guid': 'guid',
+    'id': 'guid',
+}
+_CORE_NAMESPACES = (None, ATOM_NS, RSS1_NS)
+
+# ...and by qualified name for the common extension modules
+_EXTENSION_FIELDS = {
+    f'{{{CONTENT_NS}}}encoded': 'content',
+    f'{{{DC_NS}}}creator': 'author',
+    f'{{{DC_NS}}}date': 'updated',
+}
+
+# Image-bearing elements, searched anywhere in the entry (e.g. inside media:group)
+_MEDIA_FIELDS = {
+    f'{{{MEDIA_NS}}}content': 'media_content',
+    f'{{{MEDIA_NS}}}thumbnail': 'media_thumbnail',
+    'enclosure': 'enclosure',
+}
+
+_SCRIPT_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_BLOCK_TAG_RE = re.compile(r'<\s*/?\s*(?:p|div|br|li|ul|ol|h[1-6]|figure|figcaption|blockquote|tr|td|img)\b[^>]*>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]*>')
+_SPACE_RE = re.compile(r'\s+')
+_IMG_SRC_RE = re.compile(r'<img\b[^>]*?\bsrc\s*=\s*(?:"([^"]+)"|\'([^\']+)\')', re.IGNORECASE)
+
+
+def html_to_text(fragment: Optional[str], limit: Optional[int] = None) -> str:
+    """Plain text of an HTML snippet (feed descriptions), whitespace collapsed"""
+    if not fragment:
+        return ''
+    text = fragment
+    if '<' in text:
+        text = _SCRIPT_RE.sub(' ', text)
+        text = _BLOCK_TAG_RE.sub(' ', text)
+        text = _TAG_RE.sub('', text)
+    text = _SPACE_RE.sub(' ', html.unescape(text)).strip()
+    return text[:limit] if limit is not None else text
+
+def first_image(fragment: Optional[str]) -> Optional[str]:
+    """src of the first <img> in an HTML snippet"""
+    if not fragment:
+        return None
+    match = _IMG_SRC_RE.search(fragment)
+    if not match:
+        return None
+    return html.unescape(match.group(1) or match.group(2)).strip() or None
+
+def _is_image(elem) -> bool:
+    medium = elem.get('medium', '')
+    mime = elem.get('type', '')
+    return medium in ('', 'image') and not mime.startswith(('video/', 'audio/'))
+
+def _read_entry(elem) -> Dict[str, str]:
+    """Flat field dict for one <item>/<entry> (first occurrence of each field wins)"""
+    entry = {}
+    for child in elem:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue  # comments / processing instructions
+        qname = etree.QName(tag)
+        if qname.namespace in _CORE_NAMESPACES:
+            field = _CORE_FIELDS.get(qname.localname)
+        else:
+            field = _EXTENSION_FIELDS.get(tag)
+        if field is None or field in entry:
+            continue
+
+        if field == 'link' and qname.namespace == ATOM_NS:
+            # Atom: <link rel="alternate" href="..."/>, other rels are enclosures etc.
+            if child.get('rel', 'alternate') != 'alternate':
+                continue
+            value = child.get('href')
+        elif field == 'author' and len(child):
+            value = child.findtext(f'{{{ATOM_NS}}}name') or child.findtext('name')
+        else:
+            value = child.text
+        if value and value.strip():
+            entry[field] = value.strip()
+
+    for media in elem.iter(*_MEDIA_FIELDS):
+        field = _MEDIA_FIELDS[media.tag]
+        if field not in entry and media.get('url') and _is_image(media):
+            entry[field] = media.get('url')
+    return entry
+
+def iter_entries(content: bytes, limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """Stream the entries of an RSS / Atom document as field dicts.
+
+    Stops parsing once `limit` entries were read, and frees each entry's
+    subtree as it goes. Malformed feeds are parsed in lxml's recover mode.
+    """
+    if limit is not None and limit <= 0:
+        return
+    parser = etree.iterparse(io.BytesIO(content.lstrip()), events=('end',), tag=ENTRY_TAGS,
+                             recover=True, resolve_entities=False, no_network=True)
+    count = 0
+    for _, elem in parser:
+        yield _read_entry(elem)
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+        count += 1
+        if limit is not None and count >= limit:
+            break
+
+def entry_image(entry: Dict[str, str]) -> Optional[str]:
+    """Best image for an entry: media tags, enclosure, then the first inline <img>"""
+    return (entry.get('media_content') or entry.get('media_thumbnail') or entry.get('enclosure')
+            or first_image(entry.get('description')) or first_image(entry.get('content')))
+
+def make_article(entry: Dict[str, str], source: str, category: str,
+                 description_chars: Optional[int] = 200) -> Dict:
+    """Article dict in the schema the frontend expects (description omitted when None)"""
+    published = entry.get('published') or entry.get('updated', 'Unknown Date')
+    article = {
+        'title': entry.get('title', 'No Title'),
+        'link': entry.get('link', '#'),
+        'published': published,
+        'published_epoch': parse_published(published),
+        'source': source,
+        'category': category,
+    }
+    if description_chars is not None:
+        article['description'] = html_to_text(entry.get('description'), description_chars)
+    article['image'] = entry_image(entry)
+    return article
+
+def parse_feed(content: bytes, source: str, category: str, limit: int = 8,
+               description_chars: Optional[int] = 200) -> List[Dict]:
+    """Articles for the first `limit` entries of a feed"""
+    return [make_article(entry, source, category, description_chars)
+            for entry in iter_entries(content, limit)]
+
+def parse_feed_response(response, source: str, category: str,
+                        description_chars: Optional[int] = 200, limit: int = 8) -> List[Dict]:
+    """Fetch engine parse callback for plain RSS / Atom sources"""
+    return parse_feed(response.content, source, category, limit, description_chars)
+
+# ============================================
+# GITHUB TRENDING (HTML)
+# ============================================
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_REPO_XPATH = etree.XPath(f"//article[{_has_class('Box-row')}]")
+_REPO_TITLE_XPATH = etree.XPath('.//h2//a[@href]')
+_REPO_DESC_XPATH = etree.XPath('.//p')
+_REPO_STARS_XPATH = etree.XPath(f".//a[{_has_class('Link--muted')}]")
+_REPO_LANG_XPATH = etree.XPath(".//*[@itemprop='programmingLanguage']")
+_REPO_AVATAR_XPATH = etree.XPath(f".//img[{_has_class('avatar')}]")
+
+def _first(xpath, elem):
+    found = xpath(elem)
+    return found[0] if found else None
+
+def _stripped_text(elem) -> str:
+    """Text of an element with every text node stripped (like get_text(strip=True))"""
+    return ''.join(piece.strip() for piece in elem.itertext())
+
+def github_trending_articles(content: bytes, limit: int = 10) -> List[Dict]:
+    """Articles for the repositories on the GitHub Trending page"""
+    doc = lxml.html.fromstring(content)
+    articles = []
+    for repo in _REPO_XPATH(doc)[:limit]:
+        title_elem = _first(_REPO_TITLE_XPATH, repo)
+        if title_elem is None:
+            continue
+        desc_elem = _first(_REPO_DESC_XPATH, repo)
+        stars_elem = _first(_REPO_STARS_XPATH, repo)
+        lang_elem = _first(_REPO_LANG_XPATH, repo)
+        avatar_elem = _first(_REPO_AVATAR_XPATH, repo)
+
+        articles.append({
+            'title': _stripped_text(title_elem).replace(' ', ''),
+            'link': f"https://github.com{title_elem.get('href', '')}",
+            'published': 'Trending Today',
+            'published_epoch': None,
+            'source': 'GitHub Trending',
+            'category': 'github',
+            'description': _stripped_text(desc_elem) if desc_elem is not None else '',
+            'language': _stripped_text(lang_elem) if lang_elem is not None else 'Unknown',
+            'stars': _stripped_text(stars_elem) if stars_elem is not None else '0',
+            # Owner avatar doubles as the card image
+            'image': avatar_elem.get('src') if avatar_elem is not None else None,
+        })
+    return articles
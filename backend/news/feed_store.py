@@ -0,0 +1,116 @@
+"""
+Feed Store - Remembers ETag / Last-Modified and the last parse of each feed URL
+so refreshes can send conditional requests and reuse the parse on a 304
+"""
+import os
+import json
+import copy
+import time
+import threading
+from typing import Any, Dict, Optional
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache')
+FEED_STORE_FILE = os.path.join(CACHE_DIR, 'feed_store.json')
+
+# Feeds are a fixed handful, but Medium tags come from the URL - keep it bounded
+MAX_ENTRIES = 200
+
+
+class FeedStore:
+    """Per-URL validators + parsed results, persisted to cache/feed_store.json"""
+
+    def __init__(self, path: str = FEED_STORE_FILE):
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries = None
+        self._hits = 0
+        self._misses = 0
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            print(f"[Feed Store] Loaded validators for {len(self._entries)} feeds")
+        except FileNotFoundError:
+            self._entries = {}
+        except Exception as e:
+            print(f"[Feed Store] Could not load {self._path}: {e}")
+            self._entries = {}
+
+    def _save(self):
+        """Write the store atomically (called with the lock held)"""
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            print(f"[Feed Store] Error saving: {e}")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for a URL we hold a parse for"""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(url)
+        headers = {}
+        if entry and entry.get('parsed') is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def reuse(self, url: str, response) -> Optional[Any]:
+        """Previous parse when the server answered 304, else None"""
+        if response.status_code != 304:
+            return None
+        with self._lock:
+            self._load()
+            entry = self._entries.get(url)
+            if not entry or entry.get('parsed') is None:
+                return None
+            entry['checked_at'] = time.time()
+            self._hits += 1
+            return copy.deepcopy(entry['parsed'])
+
+    def record(self, url: str, response, parsed: Any):
+        """Store validators and the fresh parse of a 200 response"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self._lock:
+            self._load()
+            self._misses += 1
+            if response.status_code != 200 or not (etag or last_modified) or not parsed:
+                # Nothing to revalidate against next time
+                if self._entries.pop(url, None) is not None:
+                    self._save()
+                return
+            now = time.time()
+            self._entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'parsed': copy.deepcopy(parsed),
+                'fetched_at': now,
+                'checked_at': now,
+            }
+            if len(self._entries) > MAX_ENTRIES:
+                oldest = sorted(self._entries, key=lambda u: self._entries[u].get('checked_at', 0))
+                for stale_url in oldest[:len(self._entries) - MAX_ENTRIES]:
+                    del self._entries[stale_url]
+            self._save()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._load()
+            return {
+                "feeds": len(self._entries),
+                "not_modified_hits": self._hits,
+                "full_fetches": self._misses,
+            }
+
+
+# Global feed store instance
+feed_store = FeedStore()
@@ -0,0 +1,467 @@
+"""
+Fetch Engine - Runs every source fetch of a refresh on one shared asyncio event loop
+"""
+import os
+import copy
+import time
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .http_client import http_get as session_get, http_get_head
+from .feed_store import feed_store
+from .source_health import source_health, SourceUnavailable
+
+# Global cap on outbound requests in flight across all aggregators
+MAX_CONCURRENCY = int(os.getenv("FETCH_MAX_CONCURRENCY", "16"))
+# Workers that run parse callbacks (CPU work, kept off the event loop)
+PARSE_WORKERS = int(os.getenv("FETCH_PARSE_WORKERS", "6"))
+# Default per-source budget in seconds (matches the old future.result(timeout=15))
+DEFAULT_JOB_TIMEOUT = 15
+DEFAULT_REQUEST_TIMEOUT = 10
+# Recent aggregations that hit their deadline, kept for the admin panel
+CUTOFF_HISTORY = 20
+
+# Marks which engine pool (if any) the current thread belongs to
+_local = threading.local()
+
+def _mark_thread(role: str):
+    _local.role = role
+
+def _current_role() -> Optional[str]:
+    return getattr(_local, 'role', None)
+
+def _time_left() -> Optional[float]:
+    """Seconds until this thread's deadline() runs out (None = no deadline)"""
+    until = getattr(_local, 'deadline', None)
+    return None if until is None else until - time.monotonic()
+
+def http_get(url: str, **request_kwargs) -> requests.Response:
+    """Blocking GET used by the engine's I/O workers (pooled keep-alive session)"""
+    request_kwargs.setdefault('timeout', DEFAULT_REQUEST_TIMEOUT)
+    return session_get(url, **request_kwargs)
+
+
+class FetchJob:
+    """A named unit of work for the engine.
+
+    With a `url`, the engine fetches it under the concurrency cap and hands the
+    response to `parse(response, *args)`. Without one, `parse(*args)` runs as a
+    plain task - used by scrapers that drive several fetches themselves.
+    A `conditional` job revalidates against the feed store and reuses the
+    previous parse when the server answers 304 Not Modified; a `head_only`
+    job streams the page and hands the parser just its <head>. Jobs with a
+    `health_key` go through that source's circuit breaker. A job with a
+    `limit` passes it to the callback as `limit=` and keeps at most that
+    many items of a list result.
+    """
+
+    def __init__(self, name: str, parse: Callable, url: str = None, args: tuple = (),
+                 timeout: float = None, request_kwargs: Dict = None, conditional: bool = False,
+                 head_only: bool = False, health_key: str = None, limit: int = None):
+        self.name = name
+        self.parse = parse
+        self.url = url
+        self.args = tuple(args)
+        self.timeout = timeout
+        self.request_kwargs = request_kwargs or {}
+        self.conditional = conditional
+        self.head_only = head_only
+        self.health_key = health_key
+        self.limit = limit
+        self.cut_off = False  # set when an aggregate deadline abandoned the job
+
+    def __repr__(self):
+        return f"FetchJob({self.name!r}, url={self.url!r})"
+
+    def memo_key(self) -> Optional[tuple]:
+        """Identity of the (source, args) pair, shared by every aggregator"""
+        key = (self.url, getattr(self.parse, '__qualname__', repr(self.parse)), self.args, self.head_only, self.limit)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def invoke(self, *head) -> Any:
+        """Call the parse callback with `head` (the response, if any), the args and the limit"""
+        if self.limit is None:
+            return self.parse(*head, *self.args)
+        return self._limited(self.parse(*head, *self.args, limit=self.limit))
+
+    def _limited(self, result: Any) -> Any:
+        if self.limit is not None and isinstance(result, list):
+            return result[:self.limit]
+        return result
+
+    def fetch_response(self) -> requests.Response:
+        """Blocking fetch of the job URL (adds validators for conditional jobs)"""
+        kwargs = self.request_kwargs
+        if self.conditional:
+            validators = feed_store.conditional_headers(self.url)
+            if validators:
+                kwargs = {**kwargs, 'headers': {**kwargs.get('headers', {}), **validators}}
+        if self.head_only:
+            return http_get_head(self.url, **kwargs)
+        return http_get(self.url, **kwargs)
+
+    def parse_response(self, response: requests.Response) -> Any:
+        """Run the parse callback, or reuse the stored parse on a 304"""
+        if response.status_code == 429 or response.status_code >= 500:
+            # Rate limited / server down: a failure, not an empty result
+            response.raise_for_status()
+        if self.conditional:
+            reused = feed_store.reuse(self.url, response)
+            if reused is not None:
+                return self._limited(reused)
+        result = self.invoke(response)
+        if self.conditional:
+            feed_store.record(self.url, response, result)
+        return result
+
+
+class FetchEngine:
+    """Single event loop + bounded worker pools shared by every scraper.
+
+    Blocking `requests` calls run on a fixed I/O pool gated by one asyncio
+    semaphore, so the number of sockets in flight never exceeds the cap no
+    matter how many aggregators run at once. Parse callbacks run on a small
+    separate pool; when a parse callback itself asks the engine for more
+    fetches (e.g. article images), those nested callbacks run right beside
+    their fetch on the I/O worker so the parse pool can never deadlock.
+
+    Inside a `refresh_cycle()`, each (source, args) pair runs once and every
+    aggregator that asks for it gets its own copy of the shared result.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, parse_workers: int = PARSE_WORKERS):
+        self._max_concurrency = max_concurrency
+        self._parse_workers = parse_workers
+        self._lock = threading.Lock()
+        self._loop = None
+        self._semaphore = None
+        self._io_pool = None
+        self._parse_pool = None
+        # Per-host caps (host -> max in flight); semaphores live on the loop
+        self._host_limits = {}
+        self._host_semaphores = {}
+        # Refresh-cycle memo: key -> asyncio task, only touched on the loop thread
+        self._memo = {}
+        self._memo_depth = 0
+        self._memo_hits = 0
+        self._cutoffs = deque(maxlen=CUTOFF_HISTORY)
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread and pools on first use (after gunicorn forks)"""
+        if self._loop is not None:
+            return self._loop
+        with self._lock:
+            if self._loop is None:
+                self._io_pool = ThreadPoolExecutor(
+                    max_workers=self._max_concurrency, thread_name_prefix='fetch-io',
+                    initializer=_mark_thread, initargs=('io',))
+                self._parse_pool = ThreadPoolExecutor(
+                    max_workers=self._parse_workers, thread_name_prefix='fetch-parse',
+                    initializer=_mark_thread, initargs=('parse',))
+                loop = asyncio.new_event_loop()
+                self._semaphore = asyncio.Semaphore(self._max_concurrency)
+                ready = threading.Event()
+
+                def run_loop():
+                    _mark_thread('loop')
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                threading.Thread(target=run_loop, name='fetch-engine', daemon=True).start()
+                ready.wait()
+                self._loop = loop
+                print(f"[Fetch Engine] Started (max concurrency {self._max_concurrency})")
+        return self._loop
+
+    def set_host_limit(self, host: str, limit: Optional[int]):
+        """Cap requests in flight to one host (None / 0 removes the cap)"""
+        with self._lock:
+            if limit:
+                self._host_limits[host] = limit
+            else:
+                self._host_limits.pop(host, None)
+            if self._loop is not None:
+                # Rebuilt with the new limit on next use
+                self._loop.call_soon_threadsafe(self._host_semaphores.pop, host, None)
+
+    # ---------- coroutines (run on the engine loop) ----------
+
+    @asynccontextmanager
+    async def _slot(self, url: str):
+        """Hold a per-host slot (if the host is capped), then a global one"""
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None and self._host_limits.get(host):
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self._host_limits[host])
+        if semaphore is None:
+            async with self._semaphore:
+                yield
+            return
+        # Waiting on a busy host never ties up a global slot
+        async with semaphore:
+            async with self._semaphore:
+                yield
+
+    async def _run_job(self, job: FetchJob, nested: bool):
+        loop = asyncio.get_running_loop()
+
+        if job.url is None:
+            return await loop.run_in_executor(self._parse_pool, job.invoke)
+
+        if nested:
+            async with self._slot(job.url):
+                return await loop.run_in_executor(self._io_pool, self._run_inline, job)
+
+        async with self._slot(job.url):
+            response = await loop.run_in_executor(self._io_pool, job.fetch_response)
+        return await loop.run_in_executor(self._parse_pool, job.parse_response, response)
+
+    async def _run_memoized(self, job: FetchJob, nested: bool):
+        key = job.memo_key() if self._memo_depth and not nested else None
+        if key is None:
+            return await self._run_job(job, nested)
+
+        shared = self._memo.get(key)
+        if shared is None:
+            shared = asyncio.ensure_future(self._run_job(job, nested))
+            self._memo[key] = shared
+        else:
+            self._memo_hits += 1
+        # shield: one caller timing out must not cancel the fetch for the others
+        return copy.deepcopy(await asyncio.shield(shared))
+
+    def _owns_run(self, job: FetchJob, nested: bool) -> bool:
+        """False when the job will just join a memoized run another caller started"""
+        key = job.memo_key() if self._memo_depth and not nested else None
+        return key is None or key not in self._memo
+
+    async def _run_tracked(self, job: FetchJob, nested: bool):
+        """_run_memoized behind the job's circuit breaker, recording the outcome"""
+        key = job.health_key
+        if key is None or not self._owns_run(job, nested):
+            return await self._run_memoized(job, nested)
+        if not source_health.allow(key):
+            raise SourceUnavailable(key)
+        started = time.monotonic()
+        ok = False
+        try:
+            result = await self._run_memoized(job, nested)
+            ok = True
+            return result
+        finally:
+            # A timeout cancels us here, which counts as a failure - but being
+            # abandoned by an aggregate deadline says nothing about the source
+            if not job.cut_off:
+                source_health.record(key, ok, time.monotonic() - started)
+
+    async def _run_guarded(self, job: FetchJob, nested: bool, default_timeout: float):
+        timeout = job.timeout or default_timeout
+        try:
+            return True, await asyncio.wait_for(self._run_tracked(job, nested), timeout)
+        except SourceUnavailable:
+            print(f"[Fetch Engine] [{job.name}] SKIPPED (circuit open)")
+        except asyncio.TimeoutError:
+            print(f"[Fetch Engine] [{job.name}] TIMEOUT after {timeout}s")
+        except Exception as e:
+            print(f"[Fetch Engine] [{job.name}] FAILED: {e}")
+        return False, None
+
+    async def _gather(self, jobs: List[FetchJob], nested: bool, default_timeout: float,
+                      deadline: Optional[float] = None):
+        tasks = [asyncio.ensure_future(self._run_guarded(job, nested, default_timeout)) for job in jobs]
+        if deadline is None:
+            return await asyncio.gather(*tasks)
+
+        done, pending = await asyncio.wait(tasks, timeout=max(deadline, 0))
+        for job, task in zip(jobs, tasks):
+            if task in pending:
+                # Detach the laggard; memoized fetches keep running for their other callers
+                job.cut_off = True
+                task.cancel()
+        return [task.result() if task in done else (False, None) for task in tasks]
+
+    # ---------- blocking API (called from request / refresh threads) ----------
+
+    def run_all(self, jobs: List[FetchJob], timeout: float = DEFAULT_JOB_TIMEOUT,
+                deadline: float = None, label: str = None) -> List[tuple]:
+        """Run jobs concurrently; returns [(job, ok, result)] in job order.
+
+        Failed or timed-out jobs come back with ok=False and are logged here,
+        so callers can simply skip them. With a `deadline` (or inside a
+        deadline() block) the call returns once it passes, whatever is still
+        running comes back as ok=False with job.cut_off set, and the cut-off
+        is recorded under `label`.
+        """
+        role = _current_role()
+        if role == 'loop':
+            raise RuntimeError("FetchEngine.run_all() cannot be called from the engine loop")
+
+        time_left = _time_left()
+        if time_left is not None:
+            deadline = time_left if deadline is None else min(deadline, time_left)
+
+        # Inside an I/O worker nothing may wait on the pool it occupies, and
+        # inside a parse worker plain tasks stay on the calling thread.
+        outcomes = {}
+        submitted = []
+        for job in jobs:
+            if role == 'io' or (role == 'parse' and job.url is None):
+                outcomes[id(job)] = self._run_inline_guarded(job)
+            else:
+                submitted.append(job)
+        for job, outcome in zip(submitted, self._submit(submitted, role == 'parse', timeout, deadline)):
+            outcomes[id(job)] = outcome
+
+        cut_off = [job.name for job in jobs if job.cut_off]
+        if cut_off:
+            self._record_cutoff(label or 'run_all', deadline, cut_off)
+        return [(job, *outcomes[id(job)]) for job in jobs]
+
+    def _record_cutoff(self, label: str, deadline: float, names: List[str]):
+        print(f"[Fetch Engine] [{label}] deadline of {max(deadline, 0):.1f}s reached, "
+              f"cut off: {', '.join(names)}")
+        with self._lock:
+            self._cutoffs.append({
+                "label": label,
+                "deadline": round(max(deadline, 0), 2),
+                "sources": names,
+                "at": datetime.now().isoformat(),
+            })
+
+    def _run_inline(self, job: FetchJob):
+        """Run a job on the calling thread (used from inside engine workers)"""
+        if job.url is None:
+            return job.invoke()
+        return job.parse_response(job.fetch_response())
+
+    def _run_inline_tracked(self, job: FetchJob):
+        """_run_inline behind the job's circuit breaker"""
+        key = job.health_key
+        if key is None:
+            return self._run_inline(job)
+        if not source_health.allow(key):
+            raise SourceUnavailable(key)
+        started = time.monotonic()
+        ok = False
+        try:
+            result = self._run_inline(job)
+            ok = True
+            return result
+        finally:
+            source_health.record(key, ok, time.monotonic() - started)
+
+    def _run_inline_guarded(self, job: FetchJob) -> tuple:
+        try:
+            return True, self._run_inline_tracked(job)
+        except SourceUnavailable:
+            print(f"[Fetch Engine] [{job.name}] SKIPPED (circuit open)")
+        except Exception as e:
+            print(f"[Fetch Engine] [{job.name}] FAILED: {e}")
+        return False, None
+
+    def _submit(self, jobs: List[FetchJob], nested: bool, timeout: float,
+                deadline: Optional[float] = None) -> List[tuple]:
+        if not jobs:
+            return []
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._gather(jobs, nested, timeout, deadline), loop)
+        return future.result()
+
+    def fetch(self, url: str, parse: Callable = None, *args, conditional: bool = False,
+              health_key: str = None, **request_kwargs) -> Any:
+        """Fetch one URL through the engine and return parse(response, *args).
+
+        Unlike run_all(), errors are raised so callers keep their own handling
+        (SourceUnavailable when `health_key`'s breaker is open).
+        """
+        parse = parse or (lambda response: response)
+        job = FetchJob(url, parse, url=url, args=args, request_kwargs=request_kwargs, conditional=conditional,
+                       health_key=health_key)
+        role = _current_role()
+        if role == 'io':
+            return self._run_inline_tracked(job)
+
+        wait = request_kwargs.get('timeout', DEFAULT_REQUEST_TIMEOUT) + DEFAULT_JOB_TIMEOUT
+        time_left = _time_left()
+        if time_left is not None:
+            if time_left <= 0:
+                raise TimeoutError(f"deadline passed before fetching {url}")
+            wait = min(wait, time_left)
+
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._run_tracked(job, role == 'parse'), loop)
+        try:
+            return future.result(timeout=wait)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def fetch_all(self, urls: List[str], parse: Callable = None, **request_kwargs) -> List[Any]:
+        """Fetch many URLs concurrently; failed entries come back as None"""
+        parse = parse or (lambda response: response)
+        jobs = [FetchJob(url, parse, url=url, request_kwargs=request_kwargs) for url in urls]
+        return [result for _, ok, result in self.run_all(jobs)]
+
+    @contextmanager
+    def refresh_cycle(self):
+        """Share source fetches between every aggregator run inside the block.
+
+        Cycles nest and overlap freely; the memo is dropped once the last
+        open cycle exits, so the next refresh fetches everything again.
+        """
+        with self._lock:
+            self._memo_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._memo_depth -= 1
+                if self._memo_depth == 0 and self._loop is not None:
+                    self._loop.call_soon_threadsafe(self._memo.clear)
+
+    @contextmanager
+    def deadline(self, seconds: float):
+        """Hard time limit for every run_all() / fetch() this thread makes inside the block.
+
+        Blocks nest; the earliest deadline wins.
+        """
+        previous = getattr(_local, 'deadline', None)
+        until = time.monotonic() + seconds
+        _local.deadline = until if previous is None else min(previous, until)
+        try:
+            yield self
+        finally:
+            _local.deadline = previous
+
+    def time_left(self) -> Optional[float]:
+        """Seconds left in the current thread's deadline() block (None outside one)"""
+        return _time_left()
+
+    def stats(self) -> Dict:
+        """Engine configuration for the admin panel"""
+        return {
+            "running": self._loop is not None,
+            "max_concurrency": self._max_concurrency,
+            "parse_workers": self._parse_workers,
+            "refresh_cycle_active": self._memo_depth > 0,
+            "memo_hits": self._memo_hits,
+            "host_limits": dict(self._host_limits),
+            "recent_cutoffs": list(self._cutoffs),
+        }
+
+
+# Global engine instance
+fetch_engine = FetchEngine()
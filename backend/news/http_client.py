@@ -0,0 +1,116 @@
+"""
+HTTP Client - Shared keep-alive session with per-host connection pools
+"""
+import os
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of per-host pools kept alive, and connections kept per host
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "32"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8"))
+# Retries for idempotent requests on connection errors / 502-504
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.3"))
+DEFAULT_TIMEOUT = 10
+# Byte cap for head-only page reads (og:image etc. live in <head>)
+HEAD_MAX_BYTES = int(os.getenv("HTTP_HEAD_MAX_BYTES", str(128 * 1024)))
+HEAD_CHUNK_SIZE = 8 * 1024
+
+# Hosts we hit many times per refresh get bigger pools
+# (override with e.g. HTTP_HOST_POOL_SIZES="news.google.com=16,github.com=4")
+HOST_POOL_MAXSIZE = {
+    'news.google.com': 16,
+    'hacker-news.firebaseio.com': 10,
+    'www.reddit.com': 4,
+}
+
+def parse_host_sizes(value: str) -> Dict[str, int]:
+    """Parse "host=n,host=n" into {host: n} (used for env overrides)"""
+    sizes = {}
+    for entry in filter(None, (part.strip() for part in value.split(','))):
+        host, _, size = entry.partition('=')
+        try:
+            sizes[host.strip()] = int(size)
+        except ValueError:
+            print(f"[HTTP] Ignoring bad host size entry: {entry}")
+    return sizes
+
+HOST_POOL_MAXSIZE.update(parse_host_sizes(os.getenv("HTTP_HOST_POOL_SIZES", "")))
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+def _make_adapter(pool_maxsize: int) -> HTTPAdapter:
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=HTTP_MAX_RETRIES,
+        status=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),  # never replay POSTs
+        raise_on_status=False,
+    )
+    return HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    default_adapter = _make_adapter(HTTP_POOL_MAXSIZE)
+    session.mount('http://', default_adapter)
+    session.mount('https://', default_adapter)
+    for host, size in HOST_POOL_MAXSIZE.items():
+        session.mount(f'https://{host}/', _make_adapter(size))
+    return session
+
+def get_session() -> requests.Session:
+    """Process-wide session (rebuilt after fork so gunicorn workers never share sockets)"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared keep-alive session"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return get_session().get(url, **kwargs)
+
+def http_get_head(url: str, max_bytes: int = HEAD_MAX_BYTES, **kwargs) -> requests.Response:
+    """GET that streams the page and stops at </head> (or `max_bytes`).
+
+    The returned response's `.content` holds only the bytes read, so callers
+    can treat it like a normal response without downloading the whole body.
+    """
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    response = get_session().get(url, stream=True, **kwargs)
+    buffer = bytearray()
+    try:
+        for chunk in response.iter_content(chunk_size=HEAD_CHUNK_SIZE):
+            # Look a few bytes back so a tag split across chunks is still found
+            search_from = max(0, len(buffer) - 8)
+            buffer.extend(chunk)
+            window = bytes(buffer[search_from:]).lower()
+            if b'</head' in window or b'<body' in window or len(buffer) >= max_bytes:
+                break
+    finally:
+        response.close()
+    response._content = bytes(buffer[:max_bytes])
+    response._content_consumed = True
+    return response
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared keep-alive session"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return get_session().post(url, **kwargs)
@@ -0,0 +1,281 @@
+"""
+Image Resolver - Finds the lead image of article pages, with a disk-persisted
+URL -> image cache (TTL + LRU, negative results included)
+"""
+import os
+import re
+import json
+import time
+import html
+import threading
+from collections import OrderedDict
+from concurrent.futures import wait
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from .fetch_engine import fetch_engine, FetchJob
+from .scraper_client import is_scraper_available, og_image_client
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache')
+IMAGE_CACHE_FILE = os.path.join(CACHE_DIR, 'image_cache.json')
+
+# Found images rarely change; pages without one are retried less eagerly
+IMAGE_TTL = int(os.getenv("IMAGE_CACHE_TTL", str(7 * 24 * 3600)))
+NEGATIVE_TTL = int(os.getenv("IMAGE_CACHE_NEGATIVE_TTL", str(6 * 3600)))
+MAX_ENTRIES = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "3000"))
+
+# Same headers the scrapers use for article pages
+PAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+# Body images that are almost never the article's lead image
+SKIP_IMAGE_HINTS = ('logo', 'icon', 'avatar', 'badge', 'button')
+
+# Meta tags checked in <head>, best first
+HEAD_IMAGE_KEYS = ('og:image', 'og:image:url', 'og:image:secure_url', 'twitter:image', 'twitter:image:src')
+
+_META_TAG_RE = re.compile(rb'<meta\s[^>]*>', re.IGNORECASE)
+_ATTR_RE = re.compile(rb'([a-zA-Z_:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+
+_MISSING = object()
+
+# find_head_image() result for a page that answered 4xx: no image, and no body
+# pass either (an error page's <img> is not the article's). Rate limits and
+# 5xx already fail the fetch job, so those pages are retried instead.
+BLOCKED = ''
+
+
+def _absolute(src: str, page_url: str) -> str:
+    if src.startswith('//'):
+        return 'https:' + src
+    if src.startswith('/'):
+        return urljoin(page_url, src)
+    return src
+
+def scan_head_meta(head: bytes) -> Dict[str, str]:
+    """property/name -> content for every <meta> tag, without building a DOM"""
+    meta = {}
+    for tag in _META_TAG_RE.finditer(head):
+        attrs = {}
+        for match in _ATTR_RE.finditer(tag.group(0)):
+            value = next(v for v in match.group(2, 3, 4) if v is not None)
+            attrs[match.group(1).lower()] = value
+        key = attrs.get(b'property') or attrs.get(b'name')
+        content = attrs.get(b'content')
+        if key and content is not None:
+            key = key.decode('utf-8', 'replace').strip().lower()
+            meta.setdefault(key, html.unescape(content.decode('utf-8', 'replace')).strip())
+    return meta
+
+def find_head_image(response) -> Optional[str]:
+    """og:image / twitter:image from a head-only response (BLOCKED for a 4xx page)"""
+    if 400 <= response.status_code < 500:
+        return BLOCKED
+    meta = scan_head_meta(response.content)
+    for key in HEAD_IMAGE_KEYS:
+        if meta.get(key):
+            return _absolute(meta[key], response.url)
+    return None
+
+def find_page_image(response, selectors: Sequence[str] = (), scan_body: bool = False) -> Optional[str]:
+    """Pick the lead image out of a full article page (fallback after the head scan).
+
+    Order: site-specific CSS `selectors`, og:image, twitter:image, then (with
+    `scan_body`) the first reasonably large non-logo <img>.
+    """
+    soup = BeautifulSoup(response.content, 'html.parser')
+
+    for selector in selectors:
+        img = soup.select_one(selector)
+        if img and img.get('src'):
+            return _absolute(img.get('src'), response.url)
+
+    og_image = soup.find('meta', property='og:image')
+    if og_image and og_image.get('content'):
+        return _absolute(og_image.get('content'), response.url)
+
+    twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
+    if twitter_image and twitter_image.get('content'):
+        return _absolute(twitter_image.get('content'), response.url)
+
+    if scan_body:
+        for img in soup.find_all('img'):
+            src = img.get('src', '')
+            width = img.get('width', '')
+            if src and (int(width) > 200 if width.isdigit() else True):
+                if not any(skip in src.lower() for skip in SKIP_IMAGE_HINTS):
+                    return _absolute(src, response.url)
+    return None
+
+
+class ImageResolver:
+    """One place that turns article URLs into image URLs, remembering answers"""
+
+    def __init__(self, path: str = IMAGE_CACHE_FILE, max_entries: int = MAX_ENTRIES):
+        self._path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = None  # OrderedDict, least recently used first
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            now = time.time()
+            for url, entry in data.items():
+                if self._is_fresh(entry, now):
+                    self._entries[url] = entry
+            print(f"[Image Resolver] Loaded {len(self._entries)} cached images")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Image Resolver] Could not load {self._path}: {e}")
+
+    @staticmethod
+    def _is_fresh(entry: Dict, now: float) -> bool:
+        ttl = IMAGE_TTL if entry.get('image') else NEGATIVE_TTL
+        return now - entry.get('resolved_at', 0) < ttl
+
+    def _lookup(self, url: str):
+        """Cached image (may be None for a negative entry) or _MISSING"""
+        entry = self._entries.get(url)
+        if entry is None:
+            return _MISSING
+        if not self._is_fresh(entry, time.time()):
+            del self._entries[url]
+            self._dirty = True
+            return _MISSING
+        self._entries.move_to_end(url)
+        return entry.get('image')
+
+    def _store(self, url: str, image: Optional[str]):
+        self._entries[url] = {'image': image, 'resolved_at': time.time()}
+        self._entries.move_to_end(url)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def save(self):
+        """Persist the cache atomically if anything changed"""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                tmp_path = f"{self._path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self._path)
+                self._dirty = False
+            except Exception as e:
+                print(f"[Image Resolver] Error saving: {e}")
+
+    def _store_remote(self, url: str, future):
+        """Done-callback for Playwright results (late ones land in the cache too)"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self._load()
+            self._store(url, future.result())
+
+    def _resolve_remote(self, urls: List[str], timeout: float) -> Dict:
+        """url -> future for pages sent to the Playwright service"""
+        if not urls or not is_scraper_available():
+            return {}
+        futures = {url: og_image_client.submit(url) for url in urls}
+        for url, future in futures.items():
+            future.add_done_callback(partial(self._store_remote, url))
+        wait(list(futures.values()), timeout=timeout)
+        return futures
+
+    def resolve_many(self, urls: List[str], selectors: Sequence[str] = (), scan_body: bool = False,
+                     timeout: int = 4, remote: bool = False, remote_timeout: float = 5,
+                     **request_kwargs) -> List[Optional[str]]:
+        """Image for each page URL (None when the page has none or can't be fetched).
+
+        With `remote`, pages that still have no image are rendered by the
+        Playwright service (a few calls at once); answers slower than
+        `remote_timeout` are cached for the next call.
+        """
+        results = {}
+        with self._lock:
+            self._load()
+            for url in urls:
+                cached = self._lookup(url)
+                if cached is _MISSING:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+                    results[url] = cached
+
+        pending = [url for url in dict.fromkeys(urls) if url not in results]
+        if pending:
+            request_kwargs.setdefault('headers', PAGE_HEADERS)
+            request_kwargs['timeout'] = timeout
+
+            # Pass 1: stream only <head> and scan its meta tags
+            head_jobs = [FetchJob(url, find_head_image, url=url, request_kwargs=request_kwargs,
+                                  head_only=True) for url in pending]
+            resolved = {job.url: (ok, image) for job, ok, image in fetch_engine.run_all(head_jobs)}
+
+            # Pass 2: full page parse only where the head had nothing and the
+            # caller has body strategies (site selectors / large <img> scan)
+            if selectors or scan_body:
+                body_urls = [url for url, (ok, image) in resolved.items() if ok and image is None]
+                body_jobs = [FetchJob(url, find_page_image, url=url, args=(tuple(selectors), scan_body),
+                                      request_kwargs=request_kwargs) for url in body_urls]
+                for job, ok, image in fetch_engine.run_all(body_jobs):
+                    resolved[job.url] = (ok, image)
+
+            # Pass 3: Playwright service for whatever is still missing
+            remote_futures = {}
+            if remote:
+                remote_futures = self._resolve_remote(
+                    [url for url, (ok, image) in resolved.items() if not image], remote_timeout)
+
+            with self._lock:
+                for url, (ok, image) in resolved.items():
+                    future = remote_futures.get(url)
+                    if future is not None and future.done() and future.exception() is None:
+                        ok, image = True, future.result()
+                    elif future is not None and not future.done():
+                        ok = False  # the done-callback caches the answer when it lands
+                    image = image or None
+                    results[url] = image
+                    # Only cache answers from pages that answered (4xx included, as
+                    # negatives), so timeouts, 429/5xx and network errors are retried
+                    if ok:
+                        self._store(url, image)
+            self.save()
+
+        return [results.get(url) for url in urls]
+
+    def resolve(self, url: str, **kwargs) -> Optional[str]:
+        """Image for a single page URL"""
+        return self.resolve_many([url], **kwargs)[0]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._load()
+            return {
+                "entries": len(self._entries),
+                "negative_entries": sum(1 for e in self._entries.values() if not e.get('image')),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# Global image resolver instance
+image_resolver = ImageResolver()
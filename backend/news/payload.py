@@ -0,0 +1,181 @@
+"""
+Payload - Cursor pagination, field projection and HTTP revalidation (ETag /
+304, Cache-Control) for the news_bp responses, so clients can fetch one screen
+of slim article cards at a time and skip downloads that haven't changed
+"""
+import os
+import json
+import base64
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from flask import jsonify, make_response, request
+
+from .ranking import published_epoch
+
+# Page size when a cursor is given without a limit, and the largest page served
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Named field sets usable in fields= (e.g. fields=card or fields=card,description)
+CARD_FIELDS = ('title', 'link', 'source', 'image', 'published_epoch')
+PROFILES = {'card': CARD_FIELDS}
+
+# Browsers / the CDN may reuse a response for HTTP_MAX_AGE seconds, then keep
+# serving it for HTTP_STALE_WHILE_REVALIDATE seconds while they revalidate
+HTTP_MAX_AGE = int(os.getenv("NEWS_HTTP_MAX_AGE", "60"))
+HTTP_STALE_WHILE_REVALIDATE = int(os.getenv("NEWS_HTTP_STALE_WHILE_REVALIDATE", "600"))
+CACHE_CONTROL = f"public, max-age={HTTP_MAX_AGE}, stale-while-revalidate={HTTP_STALE_WHILE_REVALIDATE}"
+# ?refresh=true responses must not be reused
+NO_STORE = "no-store"
+
+# list name -> (article list, its length, content hash); cached lists are the same object until
+# their category changes, so each category version is hashed once
+_content_hashes = {}
+
+
+class PageRequestError(ValueError):
+    """Malformed limit / cursor / fields query parameter"""
+
+
+def _position_key(article: Dict) -> str:
+    """Short fingerprint of an article, so a cursor can find its place again after a refresh"""
+    identity = article.get('link') or article.get('title') or ''
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=6).hexdigest()
+
+def content_hash(name: str, articles: List[Dict]) -> str:
+    """Hash of an article list, remembered while the list object stays the same"""
+    memo = _content_hashes.get(name)
+    if memo is not None and memo[0] is articles and memo[1] == len(articles):
+        return memo[2]
+    payload = json.dumps(articles, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    _content_hashes[name] = (articles, len(articles), digest)
+    return digest
+
+def encode_cursor(positions: Dict[str, Tuple[int, str]]) -> str:
+    raw = json.dumps(positions, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Dict[str, Tuple[int, str]]:
+    """list name -> (offset, key of the last article served)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        positions = json.loads(raw.decode('utf-8'))
+        return {name: (int(offset), str(key)) for name, (offset, key) in positions.items()}
+    except (ValueError, TypeError, AttributeError):
+        raise PageRequestError("Invalid cursor")
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Requested article fields (profiles expanded), or None for whole articles"""
+    if not value:
+        return None
+    fields = []
+    for name in (part.strip() for part in value.split(',')):
+        for field in PROFILES.get(name, (name,)):
+            if field and field not in fields:
+                fields.append(field)
+    if not fields:
+        raise PageRequestError("fields must name at least one field")
+    return fields
+
+def project(article: Dict, fields: Optional[List[str]]) -> Dict:
+    """The requested fields of an article (missing ones are left out)"""
+    if fields is None:
+        return article
+    if 'published_epoch' in fields:
+        published_epoch(article)
+    return {field: article[field] for field in fields if field in article}
+
+
+class PageRequest:
+    """limit / cursor / fields of the current request, applied to each article list.
+
+    Without limit and cursor every list is served whole, as before. A cursor
+    holds a position per list name, so one cursor pages all categories of
+    /api/trends/all together; a list it does not mention has no more pages.
+
+    Every list passed to items() feeds the response's strong ETag, together
+    with `feed_version` and the query parameters.
+    """
+
+    def __init__(self, limit: int = None, cursor: str = None, fields: str = None,
+                 feed_version: int = 0, no_store: bool = False):
+        if limit is not None and limit < 1:
+            raise PageRequestError("limit must be a positive integer")
+        self.paginated = limit is not None or cursor is not None
+        self.limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        self.positions = decode_cursor(cursor) if cursor else None
+        self.fields = parse_fields(fields)
+        self.feed_version = feed_version
+        self.no_store = no_store
+        self.next_positions = {}
+        self.content_hashes = {}  # list name -> content hash of the full list served from
+
+    @classmethod
+    def from_request(cls, feed_version: int = 0) -> 'PageRequest':
+        try:
+            limit = int(request.args['limit']) if request.args.get('limit') else None
+        except ValueError:
+            raise PageRequestError("limit must be an integer")
+        return cls(limit, request.args.get('cursor'), request.args.get('fields'), feed_version,
+                   no_store=request.args.get('refresh', 'false').lower() == 'true')
+
+    def _start(self, name: str, articles: List[Dict]) -> Optional[int]:
+        """Index to resume from (None when the cursor says this list is done)"""
+        if self.positions is None:
+            return 0
+        if name not in self.positions:
+            return None
+        offset, key = self.positions[name]
+        if 0 < offset <= len(articles) and _position_key(articles[offset - 1]) == key:
+            return offset
+        # The list changed since the cursor was issued: continue after the same article
+        for index, article in enumerate(articles):
+            if _position_key(article) == key:
+                return index + 1
+        return min(offset, len(articles))
+
+    def items(self, name: str, articles: List[Dict]) -> List[Dict]:
+        """One page of `articles` (all of them when not paginating), projected"""
+        self.content_hashes[name] = content_hash(name, articles)
+        if not self.paginated:
+            return [project(a, self.fields) for a in articles]
+        start = self._start(name, articles)
+        if start is None:
+            return []
+        end = start + self.limit
+        if end < len(articles):
+            self.next_positions[name] = (end, _position_key(articles[end - 1]))
+        return [project(a, self.fields) for a in articles[start:end]]
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        return encode_cursor(self.next_positions) if self.next_positions else None
+
+    def etag(self) -> str:
+        """Strong validator: feed version, content hash of every list served from, query"""
+        parts = [f"v{self.feed_version}"]
+        parts += [f"{name}:{digest}" for name, digest in sorted(self.content_hashes.items())]
+        parts += [f"{key}={value}" for key, value in sorted(request.args.items(multi=True))]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+    def respond(self, body, status: int = 200):
+        """JSON response with ETag / Cache-Control, or an empty 304 when the client's
+        If-None-Match still matches. The next cursor goes in X-Next-Cursor (and
+        in `_next_cursor` of object bodies)."""
+        etag = self.etag()
+        cursor = self.next_cursor
+        # Weak comparison (RFC 7232): proxies that compress responses send back W/"..."
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+        else:
+            if cursor and isinstance(body, dict):
+                body['_next_cursor'] = cursor
+            response = jsonify(body)
+            response.status_code = status
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = NO_STORE if self.no_store else CACHE_CONTROL
+        if cursor:
+            response.headers['X-Next-Cursor'] = cursor
+        return response
@@ -0,0 +1,90 @@
+"""
+Ranking - Parsed publish times and source-priority ranks, so sort_articles
+is a plain key sort
+"""
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+# Formats seen in 'published' besides RFC 822 and ISO 8601
+PUBLISHED_FORMATS = ('%a, %d %b %Y', '%d %b %Y', '%Y-%m-%d')
+
+def parse_published(value) -> Optional[float]:
+    """Epoch seconds for a 'published' value (None for "Trending Today", "Recent", ...)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value[:1].isalpha() and ':' in value:
+        try:
+            # RFC 822 (RSS pubDate): "Wed, 03 Dec 2025 08:06:25 +0000"
+            return parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError, IndexError):
+            pass
+    if value[:1].isdigit():
+        try:
+            # ISO 8601 (Atom, Dev.to); naive times are taken as UTC
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+        except ValueError:
+            pass
+    for fmt in PUBLISHED_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue
+    return None
+
+def published_epoch(article: Dict) -> Optional[float]:
+    """The article's published_epoch, parsed (and stored) on first use for older articles"""
+    if 'published_epoch' not in article:
+        article['published_epoch'] = parse_published(article.get('published'))
+    return article['published_epoch']
+
+
+class SourceRanker:
+    """Source name -> position in the admin priority list.
+
+    A source matches a priority entry when either name contains the other
+    (case-insensitive). Each distinct source name is matched against the
+    list once and remembered; set_priority() starts over.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._priority = None  # lowercased priority list, loaded from the admin settings on first use
+        self._ranks = {}
+
+    def set_priority(self, priority: List[str]):
+        with self._lock:
+            self._priority = [p.lower() for p in priority]
+            self._ranks = {}
+
+    def _compile(self):
+        from admin import get_source_priority
+        self.set_priority(get_source_priority())
+
+    def rank(self, source: str) -> int:
+        """Index of the first matching priority entry (unknown sources rank last)"""
+        rank = self._ranks.get(source)
+        if rank is not None:
+            return rank
+        if self._priority is None:
+            self._compile()
+        with self._lock:
+            name = (source or '').lower()
+            rank = next((i for i, p in enumerate(self._priority) if p in name or name in p),
+                        len(self._priority))
+            self._ranks[source] = rank
+        return rank
+
+    def get_stats(self) -> Dict:
+        return {"priority_entries": len(self._priority or ()), "sources_ranked": len(self._ranks)}
+
+
+# Global source ranker instance
+source_ranker = SourceRanker()
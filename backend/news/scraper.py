@@ -1,15 +1,18 @@
 import requests
 from bs4 import BeautifulSoup
 from flask import Blueprint, jsonify, request
+import os
 import re
 import asyncio
+import threading
+import time
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
 import json
 import traceback
 import logging
 import urllib3
 import random
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 # Suppress SSL warnings for sites with bad certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -22,8 +25,19 @@ from .scraper_client import (
     scrape_news_source
 )
 
+# Shared fetch engine - one event loop and concurrency cap for every source
+from .fetch_engine import fetch_engine
+from .image_resolver import image_resolver
+from .feed_parser import iter_entries, make_article, parse_feed, parse_feed_response, github_trending_articles
+from .sources import Source, source_registry
+from .dedup import dedup_articles, index_articles, DEDUP_ACROSS_CATEGORIES
+from .ranking import parse_published, published_epoch, source_ranker
+from .single_flight import single_flight
+from .source_health import source_health
+from .payload import PageRequest, PageRequestError
+
 # Import admin settings
-from admin import is_playwright_enabled, get_articles_limit, get_sort_order, get_source_priority
+from admin import is_playwright_enabled, get_articles_limit, get_sort_order
 
 # Setup logging for better debugging
 logging.basicConfig(level=logging.INFO)
@@ -89,29 +103,12 @@ def sort_articles(articles: list) -> list:
         return articles
     
     elif sort_order == "time":
-        # Sort by timestamp if available, newest first
-        def get_time_key(article):
-            ts = article.get('timestamp', '')
-            if ts:
-                try:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                except:
-                    pass
-            return datetime.min
-        return sorted(articles, key=get_time_key, reverse=True)
+        # Newest first by the epoch parsed at ingestion; undated articles go to the end
+        return sorted(articles, key=lambda a: published_epoch(a) or 0, reverse=True)
     
     else:  # "priority" - default
-        priority_list = get_source_priority()
-        
-        def get_priority(article):
-            source = article.get('source', '')
-            # Check for partial match (case-insensitive)
-            for i, p_source in enumerate(priority_list):
-                if p_source.lower() in source.lower() or source.lower() in p_source.lower():
-                    return i
-            return len(priority_list)  # Unknown sources go to end
-        
-        return sorted(articles, key=get_priority)
+        # Rank per source name comes from the compiled priority index
+        return sorted(articles, key=lambda a: source_ranker.rank(a.get('source', '')))
 
 def get_placeholder_image(source: str, category: str = 'general') -> str:
     """Get a placeholder image based on source or category"""
@@ -125,70 +122,104 @@ def extract_og_image(url: str, timeout: int = 3) -> str:
     """Try to extract Open Graph image from a URL (quick, with short timeout)"""
     try:
         # Disable SSL verification for image extraction (some sites have bad certs)
-        response = requests.get(url, headers=HEADERS, timeout=timeout, verify=False)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Try Open Graph image
-        og_image = soup.find('meta', property='og:image')
-        if og_image and og_image.get('content'):
-            return og_image.get('content')
-        
-        # Try Twitter card image
-        twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
-        if twitter_image and twitter_image.get('content'):
-            return twitter_image.get('content')
-        
-        return None
+        return image_resolver.resolve(url, timeout=timeout, verify=False)
     except:
         return None
 
+def reuse_cached_images(articles: list) -> list:
+    """Copy images the news cache already resolved onto fresh articles.
+    
+    Returns the articles that still need an image, so only articles new to
+    the cache are enriched.
+    """
+    cache = get_cache()
+    missing = []
+    for article in articles:
+        if article.get('image'):
+            continue
+        cached = cache.find_article(article.get('link')) if cache else None
+        if cached and cached.get('image'):
+            article['image'] = cached['image']
+        else:
+            missing.append(article)
+    return missing
+
 # ============================================
 # RSS FEED SCRAPERS (No API Keys Required)
 # ============================================
+#
+# Each feed scraper is split into a parse callback (`parse_*`, takes the HTTP
+# response) and a `scrape_*` wrapper that fetches through the shared fetch
+# engine. Aggregators hand the parse callbacks straight to the engine.
+
+TECHCRUNCH_FEED_URL = "https://techcrunch.com/feed/"
+HN_TOP_STORIES_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
+DEV_TO_URL = "https://dev.to/api/articles?per_page={limit}&top=7"
+PRODUCTHUNT_FEED_URL = "https://www.producthunt.com/feed"
+GITHUB_TRENDING_URL = "https://github.com/trending"
+BBC_TECH_FEED_URL = "https://feeds.bbci.co.uk/news/technology/rss.xml"
+WIRED_FEED_URL = "https://www.wired.com/feed/rss"
+ARS_TECHNICA_FEED_URL = "https://feeds.arstechnica.com/arstechnica/index"
+THE_VERGE_FEED_URL = "https://www.theverge.com/rss/index.xml"
+NDTV_EDUCATION_FEED_URL = "https://feeds.feedburner.com/ndtvnews-education"
+
+# TechCrunch article pages: featured image first, OG image as the fallback
+TECHCRUNCH_IMAGE_SELECTORS = (
+    'figure img.wp-post-image',
+    'figure img',
+    'img.attachment-post-thumbnail',
+)
+
+# Request options shared by the plain feed fetches
+FEED_REQUEST = {'headers': HEADERS, 'timeout': 10}
+
+# Reddit requires a unique User-Agent, otherwise it returns 429 or empty response
+REDDIT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) PrashikshanBot/1.0 (Educational Project)',
+    'Accept': 'application/json',
+}
+
+def google_news_url(query: str) -> str:
+    """Google News RSS search URL for a query"""
+    return f"https://news.google.com/rss/search?q={query}&hl=en-IN&gl=IN&ceid=IN:en"
+
+def reddit_url(subreddit: str, limit: int) -> str:
+    """Reddit hot listing JSON URL"""
+    return f"https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}"
+
+def google_news_source(name: str, query: str, num_articles: int = 10, **options) -> Source:
+    """Source for one Google News query"""
+    options.setdefault('timeout', 8)
+    return Source(name, parse_google_news, url=google_news_url(query), args=(query,),
+                  category='general', limit=num_articles, request_kwargs={'headers': HEADERS},
+                  host_concurrency=8, **options)
+
+def reddit_source(name: str, subreddit: str, limit: int = 10, **options) -> Source:
+    """Source for one subreddit listing (Reddit rate-limits, so few requests at once)"""
+    options.setdefault('timeout', 10)
+    return Source(name, parse_reddit, url=reddit_url(subreddit, limit), args=(subreddit,),
+                  category='reddit', limit=limit, request_kwargs={'headers': REDDIT_HEADERS},
+                  host_concurrency=2, **options)
+
+def rss_source(name: str, url: str, label: str, category: str, limit: int = 8,
+               description_chars=200, **options) -> Source:
+    """Source for a plain RSS / Atom feed (revalidated with ETag / Last-Modified)"""
+    options.setdefault('timeout', 8)
+    return Source(name, parse_feed_response, url=url, args=(label, category, description_chars),
+                  category=category, limit=limit, request_kwargs={'headers': HEADERS},
+                  conditional=True, **options)
+
+def scrape_source(name: str) -> list:
+    """Fetch one registered source on its own (failures are logged, [] returned)"""
+    (_, ok, articles), = fetch_engine.run_all([source_registry.get(name).job()])
+    return articles if ok and articles is not None else []
 
 def scrape_google_news(query="technology trends", num_articles=10):
     """Scrape news from Google News RSS feed"""
     try:
-        url = f"https://news.google.com/rss/search?q={query}&hl=en-IN&gl=IN&ceid=IN:en"
+        url = google_news_url(query)
         debug_log("Google News", f"Fetching: {url}")
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        debug_log("Google News", f"Response status: {response.status_code}, size: {len(response.content)} bytes")
-        
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:num_articles]
-        debug_log("Google News", f"Found {len(items)} items for query '{query}'")
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            source = item.find('source').text if item.find('source') else 'Google News'
-            
-            title = re.sub(r'\s*-\s*[^-]+$', '', title)
-            
-            # Try to get image from media:content or enclosure
-            image = None
-            media = item.find('media:content')
-            if media and media.get('url'):
-                image = media.get('url')
-            if not image:
-                enclosure = item.find('enclosure')
-                if enclosure and enclosure.get('url'):
-                    image = enclosure.get('url')
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': source,
-                'category': 'general',
-                'image': image  # Frontend will use placeholder if None
-            })
-        
-        debug_log("Google News", f"Scraped {len(articles)} articles for '{query}'")
-        return articles
+        return fetch_engine.fetch(url, parse_google_news, query, num_articles, **FEED_REQUEST)
     except requests.exceptions.Timeout:
         debug_log("Google News", f"TIMEOUT for query '{query}'")
         return []
@@ -196,119 +227,94 @@ def scrape_google_news(query="technology trends", num_articles=10):
         debug_log("Google News", f"Failed for query '{query}'", e)
         return []
 
+def parse_google_news(response, query="technology trends", limit=10):
+    """Parse a Google News RSS search response"""
+    response.raise_for_status()
+    debug_log("Google News", f"Response status: {response.status_code}, size: {len(response.content)} bytes")
+    
+    articles = []
+    for entry in iter_entries(response.content, limit):
+        article = make_article(entry, entry.get('source', 'Google News'), 'general', description_chars=None)
+        # Titles come as "Headline - Publisher"
+        article['title'] = re.sub(r'\s*-\s*[^-]+$', '', article['title'])
+        articles.append(article)  # Frontend will use placeholder if image is None
+    
+    debug_log("Google News", f"Scraped {len(articles)} articles for '{query}'")
+    return articles
+
 def scrape_techcrunch():
     """Scrape TechCrunch RSS feed"""
-    try:
-        url = "https://techcrunch.com/feed/"
-        debug_log("TechCrunch", f"Fetching: {url}")
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        debug_log("TechCrunch", f"Response status: {response.status_code}")
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:8]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            description = item.find('description').text if item.find('description') else ''
-            
-            # Try to get image from RSS media:content first
-            image = None
-            media = item.find('media:content')
-            if media and media.get('url'):
-                image = media.get('url')
-            
-            # If no image in RSS, try media:thumbnail
-            if not image:
-                media_thumb = item.find('media:thumbnail')
-                if media_thumb and media_thumb.get('url'):
-                    image = media_thumb.get('url')
-            
-            # If still no image, try to extract from the description HTML
-            if not image and description:
-                desc_soup = BeautifulSoup(description, 'html.parser')
-                img_tag = desc_soup.find('img')
-                if img_tag and img_tag.get('src'):
-                    image = img_tag.get('src')
-            
-            clean_desc = BeautifulSoup(description, 'html.parser').get_text()[:200] + '...' if description else ''
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': 'TechCrunch',
-                'category': 'tech',
-                'description': clean_desc,
-                'image': image
-            })
-        
-        # For articles without images, fetch from article page (parallel)
-        def fetch_article_image(article):
-            if not article['image'] and article['link'] != '#':
-                try:
-                    debug_log("TechCrunch", f"Fetching image from: {article['link']}")
-                    resp = requests.get(article['link'], headers=HEADERS, timeout=5)
-                    page_soup = BeautifulSoup(resp.content, 'html.parser')
-                    
-                    # Try the specific TechCrunch image class: wp-post-image inside figure
-                    wp_img = page_soup.select_one('figure img.wp-post-image')
-                    if wp_img and wp_img.get('src'):
-                        article['image'] = wp_img.get('src')
-                        debug_log("TechCrunch", f"Found wp-post-image: {article['image'][:60]}...")
-                        return
-                    
-                    # Try any figure img
-                    figure_img = page_soup.select_one('figure img')
-                    if figure_img and figure_img.get('src'):
-                        article['image'] = figure_img.get('src')
-                        debug_log("TechCrunch", f"Found figure img: {article['image'][:60]}...")
-                        return
-                    
-                    # Try attachment-post-thumbnail class
-                    thumb_img = page_soup.select_one('img.attachment-post-thumbnail')
-                    if thumb_img and thumb_img.get('src'):
-                        article['image'] = thumb_img.get('src')
-                        debug_log("TechCrunch", f"Found thumbnail: {article['image'][:60]}...")
-                        return
-                    
-                    # Try OG image as fallback
-                    og_image = page_soup.find('meta', property='og:image')
-                    if og_image and og_image.get('content'):
-                        article['image'] = og_image.get('content')
-                        debug_log("TechCrunch", f"Found OG image: {article['image'][:60]}...")
-                except Exception as e:
-                    debug_log("TechCrunch", f"Failed to fetch image from {article['link']}", e)
-        
-        # Fetch images for ALL articles missing them
-        articles_without_images = [a for a in articles if not a['image']]
-        debug_log("TechCrunch", f"{len(articles_without_images)} articles need image fetching")
-        
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            executor.map(fetch_article_image, articles_without_images)
-        
-        debug_log("TechCrunch", f"Scraped {len(articles)} articles, {sum(1 for a in articles if a['image'])} with images")
-        return articles
-    except Exception as e:
-        debug_log("TechCrunch", "Failed to scrape", e)
-        return []
+    debug_log("TechCrunch", f"Fetching: {TECHCRUNCH_FEED_URL}")
+    return scrape_source("TechCrunch")
+
+def parse_techcrunch(response, limit=None):
+    """Parse the TechCrunch RSS feed and fill in missing images from article pages"""
+    debug_log("TechCrunch", f"Response status: {response.status_code}")
+    articles = parse_feed(response.content, 'TechCrunch', 'tech', limit=limit)
+    for article in articles:
+        if article['description']:
+            article['description'] += '...'
+    
+    # Fetch images for articles missing them that the cache hasn't seen yet
+    articles_without_images = [a for a in reuse_cached_images(articles) if a['link'] != '#']
+    debug_log("TechCrunch", f"{len(articles_without_images)} articles need image fetching")
+    
+    images = image_resolver.resolve_many(
+        [a['link'] for a in articles_without_images], selectors=TECHCRUNCH_IMAGE_SELECTORS, timeout=5,
+        remote=is_playwright_enabled()
+    )
+    for article, image in zip(articles_without_images, images):
+        if image:
+            article['image'] = image
+            debug_log("TechCrunch", f"Found image: {image[:60]}...")
+    
+    debug_log("TechCrunch", f"Scraped {len(articles)} articles, {sum(1 for a in articles if a['image'])} with images")
+    return articles
 
-def scrape_hackernews():
+# Hacker News item cache: titles and URLs never change, scores/comments are
+# refreshed once the entry is older than the TTL. Keyed by story id.
+HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{}.json"
+HN_SCORE_TTL = 600  # seconds
+HN_ITEM_CACHE_MAX = 500
+_hn_items = {}
+_hn_items_lock = threading.Lock()
+
+def _get_hn_stories(story_ids: list) -> dict:
+    """Story JSON for each id, fetching only new ids and ones past the score TTL"""
+    now = time.time()
+    with _hn_items_lock:
+        due = [sid for sid in story_ids
+               if sid not in _hn_items or now - _hn_items[sid]['fetched_at'] > HN_SCORE_TTL]
+    
+    if due:
+        debug_log("HackerNews", f"Fetching {len(due)} items ({len(story_ids) - len(due)} cached)")
+        stories = fetch_engine.fetch_all([HN_ITEM_URL.format(sid) for sid in due], lambda r: r.json(), timeout=5)
+        with _hn_items_lock:
+            for sid, story in zip(due, stories):
+                if not story:
+                    continue
+                _hn_items[sid] = {'story': story, 'fetched_at': now}
+            # Drop the oldest entries once the cache grows past its bound
+            if len(_hn_items) > HN_ITEM_CACHE_MAX:
+                oldest = sorted(_hn_items, key=lambda sid: _hn_items[sid]['fetched_at'])
+                for sid in oldest[:len(_hn_items) - HN_ITEM_CACHE_MAX]:
+                    del _hn_items[sid]
+    
+    with _hn_items_lock:
+        return {sid: _hn_items[sid]['story'] for sid in story_ids if sid in _hn_items}
+
+def scrape_hackernews(limit=10):
     """Scrape Hacker News (Y Combinator) - Top stories"""
     try:
         # Hacker News has a free API
-        top_stories_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
         debug_log("HackerNews", f"Fetching top stories...")
-        response = requests.get(top_stories_url, timeout=10)
-        story_ids = response.json()[:10]
+        story_ids = fetch_engine.fetch(HN_TOP_STORIES_URL, lambda r: r.json(), timeout=10)[:limit]
         debug_log("HackerNews", f"Got {len(story_ids)} story IDs")
         
+        stories = _get_hn_stories(story_ids)
         articles = []
         for story_id in story_ids:
-            story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-            story_response = requests.get(story_url, timeout=5)
-            story = story_response.json()
+            story = stories.get(story_id)
             
             if story and story.get('title'):
                 article_url = story.get('url', f"https://news.ycombinator.com/item?id={story_id}")
@@ -316,6 +322,7 @@ def scrape_hackernews():
                     'title': story.get('title', 'No Title'),
                     'link': article_url,
                     'published': datetime.fromtimestamp(story.get('time', 0)).strftime('%a, %d %b %Y'),
+                    'published_epoch': story.get('time'),
                     'source': 'Hacker News',
                     'category': 'tech',
                     'score': story.get('score', 0),
@@ -324,53 +331,16 @@ def scrape_hackernews():
                     '_story_id': story_id  # Keep for reference
                 })
         
-        # Fetch OG images from linked articles in parallel
-        def fetch_og_image(article):
-            if article['link'] and not article['link'].startswith('https://news.ycombinator.com'):
-                try:
-                    debug_log("HackerNews", f"Fetching OG image from: {article['link'][:50]}...")
-                    resp = requests.get(article['link'], headers=HEADERS, timeout=4)
-                    page_soup = BeautifulSoup(resp.content, 'html.parser')
-                    
-                    # Try OG image first (most reliable)
-                    og_image = page_soup.find('meta', property='og:image')
-                    if og_image and og_image.get('content'):
-                        img_url = og_image.get('content')
-                        # Make sure it's an absolute URL
-                        if img_url.startswith('//'):
-                            img_url = 'https:' + img_url
-                        elif img_url.startswith('/'):
-                            # Extract domain from article link
-                            from urllib.parse import urlparse
-                            parsed = urlparse(article['link'])
-                            img_url = f"{parsed.scheme}://{parsed.netloc}{img_url}"
-                        article['image'] = img_url
-                        debug_log("HackerNews", f"Found OG image for '{article['title'][:30]}...'")
-                        return
-                    
-                    # Try Twitter card image
-                    twitter_image = page_soup.find('meta', attrs={'name': 'twitter:image'})
-                    if twitter_image and twitter_image.get('content'):
-                        article['image'] = twitter_image.get('content')
-                        return
-                    
-                    # Try first large image in the page
-                    for img in page_soup.find_all('img'):
-                        src = img.get('src', '')
-                        width = img.get('width', '')
-                        if src and (int(width) > 200 if width.isdigit() else True):
-                            if not any(skip in src.lower() for skip in ['logo', 'icon', 'avatar', 'badge', 'button']):
-                                if src.startswith('//'):
-                                    src = 'https:' + src
-                                article['image'] = src
-                                return
-                                
-                except Exception as e:
-                    debug_log("HackerNews", f"Failed to get image for {article['link'][:40]}", e)
-        
-        debug_log("HackerNews", f"Fetching images for {len(articles)} articles...")
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            executor.map(fetch_og_image, articles)
+        # Fetch OG images only for linked articles new to the cache
+        linked = [a for a in reuse_cached_images(articles)
+                  if a['link'] and not a['link'].startswith('https://news.ycombinator.com')]
+        debug_log("HackerNews", f"Fetching images for {len(linked)} articles...")
+        images = image_resolver.resolve_many([a['link'] for a in linked], scan_body=True, timeout=4,
+                                             remote=is_playwright_enabled())
+        for article, image in zip(linked, images):
+            if image:
+                article['image'] = image
+                debug_log("HackerNews", f"Found OG image for '{article['title'][:30]}...'")
         
         # Remove internal reference
         for article in articles:
@@ -384,85 +354,36 @@ def scrape_hackernews():
 
 def scrape_dev_to():
     """Scrape Dev.to articles - Great for developer content"""
-    try:
-        url = "https://dev.to/api/articles?per_page=10&top=7"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        data = response.json()
-        
-        articles = []
-        for item in data:
-            articles.append({
-                'title': item.get('title', 'No Title'),
-                'link': item.get('url', '#'),
-                'published': item.get('published_at', 'Unknown Date'),
-                'source': 'Dev.to',
-                'category': 'tech',
-                'description': item.get('description', '')[:200],
-                'image': item.get('cover_image') or item.get('social_image'),
-                'tags': item.get('tag_list', []),
-                'reactions': item.get('positive_reactions_count', 0)
-            })
-        
-        debug_log("Dev.to", f"Successfully scraped {len(articles)} articles")
-        return articles
-    except Exception as e:
-        debug_log("Dev.to", "Failed to scrape", e)
-        return []
+    return scrape_source("Dev.to")
+
+def parse_dev_to(response, limit=None):
+    """Parse the Dev.to top articles API response"""
+    data = response.json()
+    
+    articles = []
+    for item in data[:limit]:
+        articles.append({
+            'title': item.get('title', 'No Title'),
+            'link': item.get('url', '#'),
+            'published': item.get('published_at', 'Unknown Date'),
+            'published_epoch': parse_published(item.get('published_at')),
+            'source': 'Dev.to',
+            'category': 'tech',
+            'description': item.get('description', '')[:200],
+            'image': item.get('cover_image') or item.get('social_image'),
+            'tags': item.get('tag_list', []),
+            'reactions': item.get('positive_reactions_count', 0)
+        })
+    
+    debug_log("Dev.to", f"Successfully scraped {len(articles)} articles")
+    return articles
 
 def scrape_reddit(subreddit="technology", limit=10):
     """Scrape Reddit JSON API"""
     try:
-        url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}"
-        # Reddit requires a unique User-Agent, otherwise it returns 429 or empty response
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) PrashikshanBot/1.0 (Educational Project)',
-            'Accept': 'application/json',
-        }
-        
+        url = reddit_url(subreddit, limit)
         debug_log("Reddit", f"Fetching r/{subreddit} from {url}")
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        debug_log("Reddit", f"Response status: {response.status_code}")
-        debug_log("Reddit", f"Response content type: {response.headers.get('content-type', 'unknown')}")
-        
-        # Check if response is valid
-        if response.status_code != 200:
-            debug_log("Reddit", f"Non-200 status code: {response.status_code}, Response: {response.text[:500]}")
-            return []
-        
-        # Check if response is JSON
-        content_type = response.headers.get('content-type', '')
-        if 'application/json' not in content_type and 'text/json' not in content_type:
-            debug_log("Reddit", f"Unexpected content type: {content_type}")
-            debug_log("Reddit", f"Response body preview: {response.text[:500]}")
-            return []
-        
-        try:
-            data = response.json()
-        except json.JSONDecodeError as json_err:
-            debug_log("Reddit", f"JSON decode error. Response text: {response.text[:500]}", json_err)
-            return []
-        
-        articles = []
-        children = data.get('data', {}).get('children', [])
-        debug_log("Reddit", f"Found {len(children)} posts in r/{subreddit}")
-        
-        for post in children:
-            post_data = post.get('data', {})
-            if not post_data.get('stickied'):  # Skip pinned posts
-                articles.append({
-                    'title': post_data.get('title', 'No Title'),
-                    'link': f"https://reddit.com{post_data.get('permalink', '')}",
-                    'published': datetime.fromtimestamp(post_data.get('created_utc', 0)).strftime('%a, %d %b %Y'),
-                    'source': f"r/{subreddit}",
-                    'category': 'reddit',
-                    'score': post_data.get('score', 0),
-                    'comments': post_data.get('num_comments', 0),
-                    'image': post_data.get('thumbnail') if post_data.get('thumbnail', '').startswith('http') else None
-                })
-        
-        debug_log("Reddit", f"Successfully scraped {len(articles)} articles from r/{subreddit}")
-        return articles
+        return fetch_engine.fetch(url, parse_reddit, subreddit, headers=REDDIT_HEADERS, timeout=15)
     except requests.exceptions.Timeout:
         debug_log("Reddit", f"Timeout while fetching r/{subreddit}")
         return []
@@ -473,13 +394,59 @@ def scrape_reddit(subreddit="technology", limit=10):
         debug_log("Reddit", f"Unexpected error scraping r/{subreddit}", e)
         return []
 
-def scrape_producthunt():
+def parse_reddit(response, subreddit="technology", limit=None):
+    """Parse a subreddit hot listing response"""
+    debug_log("Reddit", f"Response status: {response.status_code}")
+    debug_log("Reddit", f"Response content type: {response.headers.get('content-type', 'unknown')}")
+    
+    # Check if response is valid
+    if response.status_code != 200:
+        debug_log("Reddit", f"Non-200 status code: {response.status_code}, Response: {response.text[:500]}")
+        return []
+    
+    # Check if response is JSON
+    content_type = response.headers.get('content-type', '')
+    if 'application/json' not in content_type and 'text/json' not in content_type:
+        debug_log("Reddit", f"Unexpected content type: {content_type}")
+        debug_log("Reddit", f"Response body preview: {response.text[:500]}")
+        return []
+    
+    try:
+        data = response.json()
+    except json.JSONDecodeError as json_err:
+        debug_log("Reddit", f"JSON decode error. Response text: {response.text[:500]}", json_err)
+        return []
+    
+    articles = []
+    children = data.get('data', {}).get('children', [])
+    debug_log("Reddit", f"Found {len(children)} posts in r/{subreddit}")
+    
+    for post in children:
+        post_data = post.get('data', {})
+        if not post_data.get('stickied'):  # Skip pinned posts
+            articles.append({
+                'title': post_data.get('title', 'No Title'),
+                'link': f"https://reddit.com{post_data.get('permalink', '')}",
+                'published': datetime.fromtimestamp(post_data.get('created_utc', 0)).strftime('%a, %d %b %Y'),
+                'published_epoch': post_data.get('created_utc'),
+                'source': f"r/{subreddit}",
+                'category': 'reddit',
+                'score': post_data.get('score', 0),
+                'comments': post_data.get('num_comments', 0),
+                'image': post_data.get('thumbnail') if post_data.get('thumbnail', '').startswith('http') else None
+            })
+    articles = articles[:limit]
+    
+    debug_log("Reddit", f"Successfully scraped {len(articles)} articles from r/{subreddit}")
+    return articles
+
+def scrape_producthunt(limit=10):
     """Scrape Product Hunt - Uses Playwright if enabled and available"""
     # Try HF Spaces Playwright scraper first (JS-heavy site) - if enabled
     if is_playwright_enabled() and is_scraper_available():
         debug_log("Product Hunt", "Using HF Spaces Playwright scraper")
         try:
-            articles = scrape_news_source("producthunt")
+            articles = scrape_news_source("producthunt")[:limit]
             if articles:
                 debug_log("Product Hunt", f"Got {len(articles)} articles from Playwright")
                 return articles
@@ -491,76 +458,28 @@ def scrape_producthunt():
     # Fallback to RSS feed
     debug_log("Product Hunt", "Using RSS feed fallback")
     try:
-        url = "https://www.producthunt.com/feed"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:10]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            description = item.find('description').text if item.find('description') else ''
-            
-            clean_desc = BeautifulSoup(description, 'html.parser').get_text()[:200] if description else ''
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': 'Product Hunt',
-                'category': 'products',
-                'description': clean_desc,
-                'image': None
-            })
-        
-        return articles
+        return fetch_engine.fetch(PRODUCTHUNT_FEED_URL, parse_producthunt, limit, conditional=True, **FEED_REQUEST)
     except Exception as e:
         print(f"Error scraping Product Hunt: {e}")
         return []
 
+def parse_producthunt(response, limit=None):
+    """Parse the Product Hunt RSS feed"""
+    articles = parse_feed(response.content, 'Product Hunt', 'products', limit=limit)
+    for article in articles:
+        article['image'] = None  # Cards use the Product Hunt placeholder
+    return articles
+
 def scrape_github_trending():
     """Scrape GitHub Trending repositories"""
-    try:
-        url = "https://github.com/trending"
-        debug_log("GitHub", f"Fetching: {url}")
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        repos = soup.select('article.Box-row')[:10]
-        debug_log("GitHub", f"Found {len(repos)} trending repos")
-        
-        articles = []
-        for repo in repos:
-            title_elem = repo.select_one('h2 a')
-            desc_elem = repo.select_one('p')
-            stars_elem = repo.select_one('a.Link--muted')
-            lang_elem = repo.select_one('[itemprop="programmingLanguage"]')
-            avatar_elem = repo.select_one('img.avatar')
-            
-            if title_elem:
-                repo_name = title_elem.get_text(strip=True).replace('\n', '').replace(' ', '')
-                # Get owner avatar as image
-                image = avatar_elem.get('src') if avatar_elem else None
-                
-                articles.append({
-                    'title': repo_name,
-                    'link': f"https://github.com{title_elem.get('href', '')}",
-                    'published': 'Trending Today',
-                    'source': 'GitHub Trending',
-                    'category': 'github',
-                    'description': desc_elem.get_text(strip=True) if desc_elem else '',
-                    'language': lang_elem.get_text(strip=True) if lang_elem else 'Unknown',
-                    'stars': stars_elem.get_text(strip=True) if stars_elem else '0',
-                    'image': image
-                })
-        
-        debug_log("GitHub", f"Scraped {len(articles)} repos")
-        return articles
-    except Exception as e:
-        debug_log("GitHub", "Failed to scrape", e)
-        return []
+    debug_log("GitHub", f"Fetching: {GITHUB_TRENDING_URL}")
+    return scrape_source("GitHub")
+
+def parse_github_trending(response, limit=None):
+    """Parse the GitHub Trending HTML page"""
+    articles = github_trending_articles(response.content, limit=limit)
+    debug_log("GitHub", f"Scraped {len(articles)} repos")
+    return articles
 
 def scrape_medium_tags(tag="technology"):
     """Scrape Medium - Uses Playwright if enabled and available"""
@@ -580,231 +499,40 @@ def scrape_medium_tags(tag="technology"):
     # Fallback to RSS feed
     debug_log("Medium", "Using RSS feed fallback")
     try:
-        url = f"https://medium.com/feed/tag/{tag}"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:8]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            creator = item.find('dc:creator').text if item.find('dc:creator') else 'Unknown Author'
-            
-            # Extract image from content
-            content = item.find('content:encoded')
-            image = None
-            if content:
-                content_soup = BeautifulSoup(content.text, 'html.parser')
-                img = content_soup.find('img')
-                if img:
-                    image = img.get('src')
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': f'Medium - {creator}',
-                'category': 'articles',
-                'image': image
-            })
-        
-        return articles
+        return fetch_engine.fetch(f"https://medium.com/feed/tag/{tag}", parse_medium_feed, conditional=True, **FEED_REQUEST)
     except Exception as e:
         print(f"Error scraping Medium: {e}")
         return []
 
+def parse_medium_feed(response):
+    """Parse a Medium tag RSS feed"""
+    return [
+        make_article(entry, f"Medium - {entry.get('author', 'Unknown Author')}", 'articles', description_chars=None)
+        for entry in iter_entries(response.content, 8)
+    ]
+
+# Plain RSS feeds are declared in the source registry below; these wrappers
+# keep the old entry points
+
 def scrape_bbc_news():
     """Scrape BBC News RSS feed"""
-    try:
-        url = "https://feeds.bbci.co.uk/news/technology/rss.xml"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:8]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            description = item.find('description').text if item.find('description') else ''
-            
-            # BBC includes thumbnail in media:thumbnail
-            image = None
-            media = item.find('media:thumbnail')
-            if media:
-                image = media.get('url')
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': 'BBC News',
-                'category': 'news',
-                'description': description[:200] if description else '',
-                'image': image
-            })
-        
-        return articles
-    except Exception as e:
-        print(f"Error scraping BBC News: {e}")
-        return []
+    return scrape_source("BBC")
 
 def scrape_wired():
     """Scrape Wired RSS feed"""
-    try:
-        url = "https://www.wired.com/feed/rss"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:8]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            description = item.find('description').text if item.find('description') else ''
-            
-            image = None
-            media = item.find('media:thumbnail')
-            if media:
-                image = media.get('url')
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': 'Wired',
-                'category': 'tech',
-                'description': BeautifulSoup(description, 'html.parser').get_text()[:200] if description else '',
-                'image': image
-            })
-        
-        return articles
-    except Exception as e:
-        print(f"Error scraping Wired: {e}")
-        return []
+    return scrape_source("Wired")
 
 def scrape_ars_technica():
     """Scrape Ars Technica RSS feed"""
-    try:
-        url = "https://feeds.arstechnica.com/arstechnica/index"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:8]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            description = item.find('description').text if item.find('description') else ''
-            
-            # Try to extract image from media:content or content
-            image = None
-            media = item.find('media:content')
-            if media and media.get('url'):
-                image = media.get('url')
-            if not image:
-                media_thumb = item.find('media:thumbnail')
-                if media_thumb and media_thumb.get('url'):
-                    image = media_thumb.get('url')
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': 'Ars Technica',
-                'category': 'tech',
-                'description': BeautifulSoup(description, 'html.parser').get_text()[:200] if description else '',
-                'image': image
-            })
-        
-        return articles
-    except Exception as e:
-        debug_log("Ars Technica", "Failed to scrape", e)
-        return []
+    return scrape_source("ArsTechnica")
 
 def scrape_the_verge():
     """Scrape The Verge RSS feed"""
-    try:
-        url = "https://www.theverge.com/rss/index.xml"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('entry')[:8]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link_elem = item.find('link')
-            link = link_elem.get('href') if link_elem else '#'
-            pub_date = item.find('published').text if item.find('published') else 'Unknown Date'
-            
-            # Extract image from content
-            content = item.find('content')
-            image = None
-            if content:
-                content_soup = BeautifulSoup(content.text, 'html.parser')
-                img = content_soup.find('img')
-                if img:
-                    image = img.get('src')
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': 'The Verge',
-                'category': 'tech',
-                'image': image
-            })
-        
-        return articles
-    except Exception as e:
-        print(f"Error scraping The Verge: {e}")
-        return []
+    return scrape_source("TheVerge")
 
 def scrape_indian_education_news():
-    """Scrape Indian Education News"""
-    try:
-        # NDTV Education RSS
-        url = "https://feeds.feedburner.com/ndtvnews-education"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:8]
-        
-        articles = []
-        for item in items:
-            title = item.find('title').text if item.find('title') else 'No Title'
-            link = item.find('link').text if item.find('link') else '#'
-            pub_date = item.find('pubDate').text if item.find('pubDate') else 'Unknown Date'
-            description = item.find('description').text if item.find('description') else ''
-            
-            # Try to extract image
-            image = None
-            media = item.find('media:content') or item.find('media:thumbnail')
-            if media and media.get('url'):
-                image = media.get('url')
-            # Try from enclosure
-            if not image:
-                enclosure = item.find('enclosure')
-                if enclosure and enclosure.get('url'):
-                    image = enclosure.get('url')
-            
-            articles.append({
-                'title': title,
-                'link': link,
-                'published': pub_date,
-                'source': 'NDTV Education',
-                'category': 'education',
-                'description': BeautifulSoup(description, 'html.parser').get_text()[:200] if description else '',
-                'image': image
-            })
-        
-        return articles
-    except Exception as e:
-        print(f"Error scraping Indian Education News: {e}")
-        return []
+    """Scrape Indian Education News (NDTV Education RSS)"""
+    return scrape_source("IndianEdu")
 
 # ============================================
 # PLAYWRIGHT SCRAPERS (For Dynamic Websites)
@@ -874,7 +602,9 @@ def scrape_twitter_trends():
     try:
         # Using Nitter instance for Twitter data (no auth required)
         url = "https://nitter.net/search?f=tweets&q=trending&since=&until=&near="
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        # Nitter instances go down often - the breaker skips it until it recovers
+        response = fetch_engine.fetch(url, health_key="Twitter", headers=HEADERS,
+                                      timeout=source_health.timeout_for("Twitter", 10))
         
         if response.status_code != 200:
             # Fallback to Google News
@@ -960,138 +690,155 @@ REFINED_QUERIES = {
     ]
 }
 
+# ============================================
+# SOURCE REGISTRY
+# ============================================
+#
+# Every source the aggregators use, declared once. `groups` are the cached
+# feeds a source contributes to; `timeout` is its whole budget (fetch +
+# parse), so slow hosts can't hold a refresh hostage. Adding a source to a
+# feed is a new entry here.
+
+source_registry.register(
+    # Tech
+    Source("TechCrunch", parse_techcrunch, url=TECHCRUNCH_FEED_URL, category='tech', limit=8,
+           timeout=15, request_kwargs={'headers': HEADERS}, conditional=True, groups=('tech',)),
+    Source("HackerNews", scrape_hackernews, category='tech', limit=10, timeout=15,
+           host='hacker-news.firebaseio.com', host_concurrency=10, groups=('tech', 'developer')),
+    Source("Dev.to", parse_dev_to, url=DEV_TO_URL, category='tech', limit=10, timeout=8,
+           request_kwargs={'headers': HEADERS}, groups=('tech', 'developer')),
+    rss_source("TheVerge", THE_VERGE_FEED_URL, 'The Verge', 'tech', description_chars=None, groups=('tech',)),
+    rss_source("Wired", WIRED_FEED_URL, 'Wired', 'tech', groups=('tech',)),
+    rss_source("ArsTechnica", ARS_TECHNICA_FEED_URL, 'Ars Technica', 'tech', groups=('tech',)),
+    rss_source("BBC", BBC_TECH_FEED_URL, 'BBC News', 'news', groups=('tech',)),
+    google_news_source("Google-AI", "AI artificial intelligence ChatGPT latest news", 5, groups=('tech',)),
+    google_news_source("Google-Dev", "software development programming trends 2024", 5, groups=('tech',)),
+    google_news_source("Google-Cyber", "cybersecurity hacking data breach news", 4, groups=('tech',)),
+
+    # Education
+    rss_source("IndianEdu", NDTV_EDUCATION_FEED_URL, 'NDTV Education', 'education', groups=('education',)),
+    google_news_source("Google-Courses", "online courses free certification Coursera Udemy", 6, groups=('education',)),
+    google_news_source("Google-Skills", "skill development training india NSDC", 5, groups=('education',)),
+    google_news_source("Google-Placement", "placement jobs campus recruitment freshers 2024", 5, groups=('education',)),
+    google_news_source("Google-Scholarship", "scholarship students india 2024 eligibility", 4, groups=('education',)),
+    google_news_source("Google-Exams", "competitive exams GATE CAT UPSC preparation tips", 4, groups=('education',)),
+    google_news_source("Google-Intern", "internship opportunities students india tech", 4, groups=('education',)),
+    google_news_source("Google-Bootcamp", "coding bootcamp learn programming india", 4, groups=('education',)),
+
+    # Developer (plus Dev.to and Hacker News above)
+    Source("GitHub", parse_github_trending, url=GITHUB_TRENDING_URL, category='github', limit=10, timeout=10,
+           request_kwargs={'headers': HEADERS}, host_concurrency=2, groups=('developer',)),
+    google_news_source("Google-WebDev", "web development react angular vue javascript", 5, groups=('developer',)),
+    google_news_source("Google-Python", "python programming tutorials tips tricks", 4, groups=('developer',)),
+    google_news_source("Google-Tools", "developer tools productivity coding", 4, groups=('developer',)),
+
+    # Career
+    google_news_source("Google-Jobs", "job openings hiring tech india bangalore hyderabad", 6, groups=('career',)),
+    google_news_source("Google-Remote", "remote work jobs opportunities work from home", 5, groups=('career',)),
+    google_news_source("Google-Salary", "salary hike increment appraisal trends india", 4, groups=('career',)),
+    google_news_source("Google-Interview", "interview preparation tips tech companies", 4, groups=('career',)),
+    google_news_source("Google-Layoffs", "layoffs hiring freeze tech industry news", 4, groups=('career',)),
+    google_news_source("Google-LinkedIn", "linkedin career tips professional networking", 4, groups=('career',)),
+    reddit_source("Reddit-CS", "cscareerquestions", 8, groups=('career',)),
+
+    # AI / ML
+    google_news_source("Google-ChatGPT", "ChatGPT OpenAI GPT-4 latest updates features", 6, groups=('ai_ml',)),
+    google_news_source("Google-Gemini", "Google Gemini Bard AI assistant news", 5, groups=('ai_ml',)),
+    google_news_source("Google-AIBiz", "artificial intelligence business applications", 5, groups=('ai_ml',)),
+    google_news_source("Google-ML", "machine learning deep learning research papers", 4, groups=('ai_ml',)),
+    google_news_source("Google-AIJobs", "AI automation jobs impact future work", 4, groups=('ai_ml',)),
+    google_news_source("Google-GenAI", "generative AI image video tools Midjourney DALL-E", 4, groups=('ai_ml',)),
+    reddit_source("Reddit-ML", "MachineLearning", 6, groups=('ai_ml',)),
+    reddit_source("Reddit-AI", "artificial", 5, groups=('ai_ml',)),
+
+    # Startups
+    Source("ProductHunt", scrape_producthunt, category='products', limit=10, timeout=15, groups=('startups',)),
+    google_news_source("Google-Funding", "startup funding series A B C india", 6, groups=('startups',)),
+    google_news_source("Google-Unicorn", "indian unicorn startup valuation news", 5, groups=('startups',)),
+    google_news_source("Google-Founders", "entrepreneur success story india founder", 4, groups=('startups',)),
+    google_news_source("Google-YC", "Y Combinator startup accelerator news", 4, groups=('startups',)),
+    google_news_source("Google-VC", "venture capital investment tech startups", 4, groups=('startups',)),
+    reddit_source("Reddit-Startups", "startups", 6, groups=('startups',)),
+
+    # General
+    google_news_source("Google-Trending", "trending india news today viral", 6, groups=('general',)),
+    google_news_source("Google-TechTrends", "technology trends 2024 2025 predictions", 5, groups=('general',)),
+    google_news_source("Google-Digital", "digital transformation business innovation", 4, groups=('general',)),
+    google_news_source("Google-FutureSkills", "future skills demand jobs 2025", 4, groups=('general',)),
+    google_news_source("Google-Fintech", "fintech digital payments UPI india", 4, groups=('general',)),
+    google_news_source("Google-EV", "electric vehicles EV india tesla", 4, groups=('general',)),
+)
+
 # ============================================
 # AGGREGATED SCRAPERS WITH REFINED QUERIES
 # ============================================
 
+# Hard limit for one aggregator (all of its sources together), in seconds.
+# Sources still running when it passes are cut off and left out.
+AGGREGATION_DEADLINE = 20
+
+def collect_articles(label: str, jobs: list, timeout: int = 15, deadline: float = AGGREGATION_DEADLINE) -> list:
+    """Run an aggregator's source jobs on the fetch engine and merge whatever finished in time.
+    
+    Near-duplicate headlines (the same story from several sources or
+    queries) are dropped, keeping the first copy in job order.
+    """
+    all_articles = []
+    cut_off = []
+    for job, ok, articles in fetch_engine.run_all(jobs, timeout=timeout, deadline=deadline, label=label):
+        if ok and articles is not None:
+            debug_log(label, f"[{job.name}] returned {len(articles)} articles")
+            all_articles.extend(articles)
+        elif job.cut_off:
+            cut_off.append(job.name)
+    if cut_off:
+        debug_log(label, f"Partial result: {len(cut_off)} sources cut off at the deadline ({', '.join(cut_off)})")
+    unique_articles = dedup_articles(all_articles)
+    debug_log(label, f"Dedup: {len(all_articles)} raw -> {len(unique_articles)} unique articles")
+    for article in unique_articles:
+        published_epoch(article)  # parse once here so sorts are plain key sorts
+    return unique_articles
+
+def dedup_across_cache(category: str, articles: list) -> list:
+    """Drop articles already cached under another category (DEDUP_ACROSS_CATEGORIES)"""
+    cache = get_cache()
+    if not DEDUP_ACROSS_CATEGORIES or cache is None or category == 'github':
+        return articles
+    others = [a for cat, cat_articles in cache.get_categories().items() if cat != category
+              for a in cat_articles]
+    unique_articles = dedup_articles(articles, index_articles(others))
+    if len(unique_articles) < len(articles):
+        debug_log("Dedup", f"{category}: dropped {len(articles) - len(unique_articles)} articles "
+                           f"already in other categories")
+    return unique_articles
+
 def get_all_tech_news():
     """Get tech news from all sources with refined queries"""
-    all_articles = []
     debug_log("get_all_tech_news", "Starting tech news aggregation...")
     
-    scrapers = [
-        ("TechCrunch", scrape_techcrunch, []),
-        ("HackerNews", scrape_hackernews, []),
-        ("Dev.to", scrape_dev_to, []),
-        ("TheVerge", scrape_the_verge, []),
-        ("Wired", scrape_wired, []),
-        ("ArsTechnica", scrape_ars_technica, []),
-        ("BBC", scrape_bbc_news, []),
-        ("Google-AI", scrape_google_news, ["AI artificial intelligence ChatGPT latest news", 5]),
-        ("Google-Dev", scrape_google_news, ["software development programming trends 2024", 5]),
-        ("Google-Cyber", scrape_google_news, ["cybersecurity hacking data breach news", 4]),
-    ]
+    all_articles = collect_articles("get_all_tech_news", source_registry.jobs('tech'))
     
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_name = {}
-        for name, func, args in scrapers:
-            future = executor.submit(func, *args) if args else executor.submit(func)
-            future_to_name[future] = name
-        
-        for future in future_to_name:
-            name = future_to_name[future]
-            try:
-                articles = future.result(timeout=15)
-                debug_log("get_all_tech_news", f"[{name}] returned {len(articles)} articles")
-                all_articles.extend(articles)
-            except TimeoutError:
-                debug_log("get_all_tech_news", f"[{name}] TIMEOUT after 15s")
-            except Exception as e:
-                debug_log("get_all_tech_news", f"[{name}] FAILED", e)
-    
-    debug_log("get_all_tech_news", f"Total raw articles: {len(all_articles)}")
-    
-    # Remove duplicates based on title similarity
-    seen_titles = set()
-    unique_articles = []
-    for article in all_articles:
-        title_key = article['title'].lower()[:50]
-        if title_key not in seen_titles:
-            seen_titles.add(title_key)
-            unique_articles.append(article)
-    
-    debug_log("get_all_tech_news", f"After dedup: {len(unique_articles)} articles")
+    debug_log("get_all_tech_news", f"After dedup: {len(all_articles)} articles")
     limit = get_articles_limit()
-    sorted_articles = sort_articles(unique_articles)
+    sorted_articles = sort_articles(all_articles)
     return sorted_articles[:limit]
 
 def get_all_education_news():
     """Get education news from multiple refined queries"""
-    all_articles = []
     debug_log("get_all_education_news", "Starting education news aggregation...")
     
-    scrapers = [
-        ("IndianEdu", scrape_indian_education_news, []),
-        ("Google-Courses", scrape_google_news, ["online courses free certification Coursera Udemy", 6]),
-        ("Google-Skills", scrape_google_news, ["skill development training india NSDC", 5]),
-        ("Google-Placement", scrape_google_news, ["placement jobs campus recruitment freshers 2024", 5]),
-        ("Google-Scholarship", scrape_google_news, ["scholarship students india 2024 eligibility", 4]),
-        ("Google-Exams", scrape_google_news, ["competitive exams GATE CAT UPSC preparation tips", 4]),
-        ("Google-Intern", scrape_google_news, ["internship opportunities students india tech", 4]),
-        ("Google-Bootcamp", scrape_google_news, ["coding bootcamp learn programming india", 4]),
-    ]
-    
-    with ThreadPoolExecutor(max_workers=6) as executor:
-        future_to_name = {}
-        for name, func, args in scrapers:
-            future = executor.submit(func, *args) if args else executor.submit(func)
-            future_to_name[future] = name
-        
-        for future in future_to_name:
-            name = future_to_name[future]
-            try:
-                articles = future.result(timeout=15)
-                debug_log("get_all_education_news", f"[{name}] returned {len(articles)} articles")
-                all_articles.extend(articles)
-            except TimeoutError:
-                debug_log("get_all_education_news", f"[{name}] TIMEOUT after 15s")
-            except Exception as e:
-                debug_log("get_all_education_news", f"[{name}] FAILED", e)
-    
-    # Remove duplicates
-    seen_titles = set()
-    unique_articles = []
-    for article in all_articles:
-        title_key = article['title'].lower()[:50]
-        if title_key not in seen_titles:
-            seen_titles.add(title_key)
-            unique_articles.append(article)
+    all_articles = collect_articles("get_all_education_news", source_registry.jobs('education'))
     
-    debug_log("get_all_education_news", f"Returning {len(unique_articles)} unique articles")
+    debug_log("get_all_education_news", f"Returning {len(all_articles)} unique articles")
     limit = get_articles_limit()
-    sorted_articles = sort_articles(unique_articles)
+    sorted_articles = sort_articles(all_articles)
     return sorted_articles[:limit]
 
 def get_developer_content():
     """Get developer-focused content from multiple sources"""
-    all_articles = []
     debug_log("get_developer_content", "Starting developer content aggregation...")
     
-    scrapers = [
-        ("Dev.to", scrape_dev_to, []),
-        ("HackerNews", scrape_hackernews, []),
-        ("GitHub", scrape_github_trending, []),
-        ("Google-WebDev", scrape_google_news, ["web development react angular vue javascript", 5]),
-        ("Google-Python", scrape_google_news, ["python programming tutorials tips tricks", 4]),
-        ("Google-Tools", scrape_google_news, ["developer tools productivity coding", 4]),
-    ]
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_name = {}
-        for name, func, args in scrapers:
-            future = executor.submit(func, *args) if args else executor.submit(func)
-            future_to_name[future] = name
-        
-        for future in future_to_name:
-            name = future_to_name[future]
-            try:
-                articles = future.result(timeout=15)
-                debug_log("get_developer_content", f"[{name}] returned {len(articles)} articles")
-                all_articles.extend(articles)
-            except TimeoutError:
-                debug_log("get_developer_content", f"[{name}] TIMEOUT after 15s")
-            except Exception as e:
-                debug_log("get_developer_content", f"[{name}] FAILED", e)
+    all_articles = collect_articles("get_developer_content", source_registry.jobs('developer'))
     
     debug_log("get_developer_content", f"Returning {len(all_articles)} articles")
     limit = get_articles_limit()
@@ -1100,35 +847,9 @@ def get_developer_content():
 
 def get_career_news():
     """Get career and job-related news"""
-    all_articles = []
     debug_log("get_career_news", "Starting career news aggregation...")
     
-    scrapers = [
-        ("Google-Jobs", scrape_google_news, ["job openings hiring tech india bangalore hyderabad", 6]),
-        ("Google-Remote", scrape_google_news, ["remote work jobs opportunities work from home", 5]),
-        ("Google-Salary", scrape_google_news, ["salary hike increment appraisal trends india", 4]),
-        ("Google-Interview", scrape_google_news, ["interview preparation tips tech companies", 4]),
-        ("Google-Layoffs", scrape_google_news, ["layoffs hiring freeze tech industry news", 4]),
-        ("Google-LinkedIn", scrape_google_news, ["linkedin career tips professional networking", 4]),
-        ("Reddit-CS", scrape_reddit, ["cscareerquestions", 8]),
-    ]
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_name = {}
-        for name, func, args in scrapers:
-            future = executor.submit(func, *args)
-            future_to_name[future] = name
-        
-        for future in future_to_name:
-            name = future_to_name[future]
-            try:
-                articles = future.result(timeout=15)
-                debug_log("get_career_news", f"[{name}] returned {len(articles)} articles")
-                all_articles.extend(articles)
-            except TimeoutError:
-                debug_log("get_career_news", f"[{name}] TIMEOUT after 15s")
-            except Exception as e:
-                debug_log("get_career_news", f"[{name}] FAILED", e)
+    all_articles = collect_articles("get_career_news", source_registry.jobs('career'))
     
     debug_log("get_career_news", f"Returning {len(all_articles)} articles")
     limit = get_articles_limit()
@@ -1138,36 +859,9 @@ def get_career_news():
 
 def get_ai_ml_news():
     """Get AI and Machine Learning specific news"""
-    all_articles = []
     debug_log("get_ai_ml_news", "Starting AI/ML news aggregation...")
     
-    scrapers = [
-        ("Google-ChatGPT", scrape_google_news, ["ChatGPT OpenAI GPT-4 latest updates features", 6]),
-        ("Google-Gemini", scrape_google_news, ["Google Gemini Bard AI assistant news", 5]),
-        ("Google-AIBiz", scrape_google_news, ["artificial intelligence business applications", 5]),
-        ("Google-ML", scrape_google_news, ["machine learning deep learning research papers", 4]),
-        ("Google-AIJobs", scrape_google_news, ["AI automation jobs impact future work", 4]),
-        ("Google-GenAI", scrape_google_news, ["generative AI image video tools Midjourney DALL-E", 4]),
-        ("Reddit-ML", scrape_reddit, ["MachineLearning", 6]),
-        ("Reddit-AI", scrape_reddit, ["artificial", 5]),
-    ]
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_name = {}
-        for name, func, args in scrapers:
-            future = executor.submit(func, *args)
-            future_to_name[future] = name
-        
-        for future in future_to_name:
-            name = future_to_name[future]
-            try:
-                articles = future.result(timeout=15)
-                debug_log("get_ai_ml_news", f"[{name}] returned {len(articles)} articles")
-                all_articles.extend(articles)
-            except TimeoutError:
-                debug_log("get_ai_ml_news", f"[{name}] TIMEOUT after 15s")
-            except Exception as e:
-                debug_log("get_ai_ml_news", f"[{name}] FAILED", e)
+    all_articles = collect_articles("get_ai_ml_news", source_registry.jobs('ai_ml'))
     
     debug_log("get_ai_ml_news", f"Returning {len(all_articles)} articles")
     limit = get_articles_limit()
@@ -1176,35 +870,9 @@ def get_ai_ml_news():
 
 def get_startup_news():
     """Get startup and entrepreneurship news"""
-    all_articles = []
     debug_log("get_startup_news", "Starting startup news aggregation...")
     
-    scrapers = [
-        ("ProductHunt", scrape_producthunt, []),
-        ("Google-Funding", scrape_google_news, ["startup funding series A B C india", 6]),
-        ("Google-Unicorn", scrape_google_news, ["indian unicorn startup valuation news", 5]),
-        ("Google-Founders", scrape_google_news, ["entrepreneur success story india founder", 4]),
-        ("Google-YC", scrape_google_news, ["Y Combinator startup accelerator news", 4]),
-        ("Google-VC", scrape_google_news, ["venture capital investment tech startups", 4]),
-        ("Reddit-Startups", scrape_reddit, ["startups", 6]),
-    ]
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_name = {}
-        for name, func, args in scrapers:
-            future = executor.submit(func, *args) if args else executor.submit(func)
-            future_to_name[future] = name
-        
-        for future in future_to_name:
-            name = future_to_name[future]
-            try:
-                articles = future.result(timeout=15)
-                debug_log("get_startup_news", f"[{name}] returned {len(articles)} articles")
-                all_articles.extend(articles)
-            except TimeoutError:
-                debug_log("get_startup_news", f"[{name}] TIMEOUT after 15s")
-            except Exception as e:
-                debug_log("get_startup_news", f"[{name}] FAILED", e)
+    all_articles = collect_articles("get_startup_news", source_registry.jobs('startups'))
     
     debug_log("get_startup_news", f"Returning {len(all_articles)} articles")
     limit = get_articles_limit()
@@ -1213,47 +881,13 @@ def get_startup_news():
 
 def get_general_trends():
     """Get general trending topics with refined queries"""
-    all_articles = []
     debug_log("get_general_trends", "Starting general trends aggregation...")
     
-    scrapers = [
-        ("Google-Trending", scrape_google_news, ["trending india news today viral", 6]),
-        ("Google-TechTrends", scrape_google_news, ["technology trends 2024 2025 predictions", 5]),
-        ("Google-Digital", scrape_google_news, ["digital transformation business innovation", 4]),
-        ("Google-Skills", scrape_google_news, ["future skills demand jobs 2025", 4]),
-        ("Google-Fintech", scrape_google_news, ["fintech digital payments UPI india", 4]),
-        ("Google-EV", scrape_google_news, ["electric vehicles EV india tesla", 4]),
-    ]
+    all_articles = collect_articles("get_general_trends", source_registry.jobs('general'))
     
-    with ThreadPoolExecutor(max_workers=6) as executor:
-        future_to_name = {}
-        for name, func, args in scrapers:
-            future = executor.submit(func, *args)
-            future_to_name[future] = name
-        
-        for future in future_to_name:
-            name = future_to_name[future]
-            try:
-                articles = future.result(timeout=15)
-                debug_log("get_general_trends", f"[{name}] returned {len(articles)} articles")
-                all_articles.extend(articles)
-            except TimeoutError:
-                debug_log("get_general_trends", f"[{name}] TIMEOUT after 15s")
-            except Exception as e:
-                debug_log("get_general_trends", f"[{name}] FAILED", e)
-    
-    # Remove duplicates
-    seen_titles = set()
-    unique_articles = []
-    for article in all_articles:
-        title_key = article['title'].lower()[:50]
-        if title_key not in seen_titles:
-            seen_titles.add(title_key)
-            unique_articles.append(article)
-    
-    debug_log("get_general_trends", f"Returning {len(unique_articles)} unique articles")
+    debug_log("get_general_trends", f"Returning {len(all_articles)} unique articles")
     limit = get_articles_limit()
-    sorted_articles = sort_articles(unique_articles)
+    sorted_articles = sort_articles(all_articles)
     return sorted_articles[:limit]
 
 # ============================================
@@ -1274,51 +908,141 @@ def get_cache():
             _news_cache = None
     return _news_cache
 
+# Stale-while-revalidate: a category past its TTL (see NewsCache.category_ttl)
+# is still served while a background thread refreshes it; only past
+# CACHE_MAX_STALE (or with nothing cached) does a request wait for the scrape
+CACHE_MAX_STALE_MINUTES = int(os.getenv("NEWS_MAX_STALE_MINUTES", str(24 * 60)))
+
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+def scrape_into_cache(category: str, scraper_func, cache, cached_articles: list = None) -> list:
+    """Scrape a category into the cache, once at a time across threads and workers.
+    
+    Concurrent callers share the running scrape's result; if another worker
+    process is scraping the category, this one waits and reuses what it saved.
+    Waiting and scraping together stay within AGGREGATION_DEADLINE.
+    """
+    def reuse_other_worker():
+        if cache.reload_if_changed() and not cache.is_stale(category=category):
+            return cache.get_articles(category) or None
+        return None
+    
+    with fetch_engine.deadline(AGGREGATION_DEADLINE):
+        try:
+            return single_flight.do(f"category:{category}",
+                                    lambda: _scrape_into_cache(category, scraper_func, cache, cached_articles),
+                                    reuse=reuse_other_worker)
+        except FutureTimeoutError:
+            debug_log("Cache", f"Scrape of {category} still running at the deadline, serving stale cache")
+            return cached_articles or []
+
+def _scrape_into_cache(category: str, scraper_func, cache, cached_articles: list = None) -> list:
+    started = time.time()
+    with fetch_engine.deadline(AGGREGATION_DEADLINE):
+        articles = scraper_func()
+    duration = time.time() - started
+    
+    if not articles and cached_articles:
+        # Every source failed or was cut off - stale articles beat an empty feed
+        debug_log("Cache", f"Scrape for {category} came back empty, serving stale cache")
+        return cached_articles
+    
+    # Merge into the cache (known articles keep what was already resolved for them)
+    cache.merge_category(category, dedup_across_cache(category, articles),
+                         limit=get_articles_limit(), sort=sort_articles)
+    cache.set_refresh_duration(duration, category=category)
+    cache.save(sync_cloud=False)  # Don't sync to cloud on every request
+    
+    return cache.get_articles(category)
+
+def _revalidate(category: str, scraper_func, cache):
+    try:
+        # Another instance may have refreshed the cloud copy already
+        if cache.sync_from_supabase(categories=[category]) and not cache.is_stale(category=category):
+            debug_log("Cache", f"Revalidated {category} from Supabase")
+            return
+        scrape_into_cache(category, scraper_func, cache, cache.get_articles(category))
+        debug_log("Cache", f"Revalidated {category} in the background")
+    except Exception as e:
+        debug_log("Cache", f"Background revalidation of {category} failed", e)
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(category)
+
+def revalidate_in_background(category: str, scraper_func, cache) -> bool:
+    """Start refreshing a category on a background thread (once per category at a time)"""
+    with _revalidating_lock:
+        if category in _revalidating or single_flight.in_flight(f"category:{category}"):
+            return False
+        _revalidating.add(category)
+    threading.Thread(target=_revalidate, args=(category, scraper_func, cache),
+                     name=f'revalidate-{category}', daemon=True).start()
+    return True
+
 def get_cached_or_scrape(category: str, scraper_func, force_refresh: bool = False):
-    """Get articles from cache or scrape if cache is empty/stale
+    """Get articles from cache, revalidating stale ones in the background
     
     Priority:
     1. If cache is valid (not stale), return from local cache
-    2. If cache is stale, try to load from Supabase first
-    3. If Supabase fails or is also stale, scrape fresh data
+    2. If cache is stale but within CACHE_MAX_STALE_MINUTES, return it and
+       refresh in the background (Supabase first, then a scrape)
+    3. If nothing is cached or it is too old to serve, load from Supabase
+       or scrape while the request waits
     """
     cache = get_cache()
     
     # If no cache system or force refresh, scrape directly
     if cache is None or force_refresh:
-        return scraper_func()
+        with fetch_engine.deadline(AGGREGATION_DEADLINE):
+            return scraper_func()
+    
+    # Another worker may have refreshed the local file already
+    if cache.is_stale(category=category):
+        cache.reload_if_changed()
     
     # Try to get from cache first
     cached_articles = cache.get_articles(category)
     
     # If cache has data and is not stale, return it
-    if cached_articles and not cache.is_stale(max_age_minutes=60):
+    if cached_articles and not cache.is_stale(category=category):
         debug_log("Cache", f"Returning {len(cached_articles)} cached {category} articles")
         return cached_articles
     
-    # Cache is stale - try to load from Supabase first
+    # Stale but servable - answer now, refresh behind the request
+    if cached_articles and not cache.is_stale(max_age_minutes=CACHE_MAX_STALE_MINUTES, category=category):
+        started = revalidate_in_background(category, scraper_func, cache)
+        debug_log("Cache", f"Serving {len(cached_articles)} stale {category} articles"
+                           f"{', revalidating' if started else ' (revalidation running)'}")
+        return cached_articles
+    
+    # Too old (or empty) - try to load from Supabase first
     debug_log("Cache", f"Local cache stale for {category}, trying Supabase...")
-    if cache.sync_from_supabase():
+    if cache.sync_from_supabase(categories=[category]):
         # Check if Supabase data is fresh
         cached_articles = cache.get_articles(category)
-        if cached_articles and not cache.is_stale(max_age_minutes=60):
+        if cached_articles and not cache.is_stale(category=category):
             debug_log("Cache", f"Loaded {len(cached_articles)} {category} articles from Supabase")
             return cached_articles
     
-    # Both local and Supabase stale, scrape fresh data
+    # Both local and Supabase stale, scrape fresh data (bounded, partial results at worst)
     debug_log("Cache", f"Cache miss for {category}, scraping fresh data...")
-    articles = scraper_func()
-    
-    # Update cache
-    cache.update_category(category, articles)
-    cache.save(sync_cloud=False)  # Don't sync to cloud on every request
-    
-    return articles
+    return scrape_into_cache(category, scraper_func, cache, cached_articles)
 
 # ============================================
 # API ROUTES (with caching)
 # ============================================
 
+def page_request() -> PageRequest:
+    """Paging / fields of the current request, with the feed version for its ETag"""
+    cache = get_cache()
+    return PageRequest.from_request(cache.get_version() if cache else 0)
+
+@news_bp.errorhandler(PageRequestError)
+def handle_page_request_error(e):
+    """Bad limit / cursor / fields parameters"""
+    return jsonify({"error": str(e)}), 400
+
 @news_bp.route('/api/trends/version', methods=['GET'])
 def get_feed_version():
     """Get current feed version - clients can poll this to check for updates"""
@@ -1334,18 +1058,21 @@ def get_feed_version():
 def get_trends():
     """Get all trending news from multiple sources (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     
     try:
-        tech_news = get_cached_or_scrape('tech', get_all_tech_news, force_refresh)
-        education_news = get_cached_or_scrape('education', get_all_education_news, force_refresh)
-        general_trends = get_cached_or_scrape('general', get_general_trends, force_refresh)
+        # Categories that miss the cache together share their source fetches
+        with fetch_engine.refresh_cycle():
+            tech_news = get_cached_or_scrape('tech', get_all_tech_news, force_refresh)
+            education_news = get_cached_or_scrape('education', get_all_education_news, force_refresh)
+            general_trends = get_cached_or_scrape('general', get_general_trends, force_refresh)
         
-        return jsonify({
-            'tech': tech_news,
-            'education': education_news,
-            'general': general_trends,
+        return page.respond({
+            'tech': page.items('tech', tech_news),
+            'education': page.items('education', education_news),
+            'general': page.items('general', general_trends),
             '_cached': not force_refresh
-        }), 200
+        })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1353,19 +1080,23 @@ def get_trends():
 def get_all_trends():
     """Get comprehensive trends from all categories (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     
     try:
-        result = {
-            'tech': get_cached_or_scrape('tech', get_all_tech_news, force_refresh),
-            'education': get_cached_or_scrape('education', get_all_education_news, force_refresh),
-            'career': get_cached_or_scrape('career', get_career_news, force_refresh),
-            'ai_ml': get_cached_or_scrape('ai_ml', get_ai_ml_news, force_refresh),
-            'startups': get_cached_or_scrape('startups', get_startup_news, force_refresh),
-            'general': get_cached_or_scrape('general', get_general_trends, force_refresh),
-            '_cached': not force_refresh
-        }
+        # Categories that miss the cache together share their source fetches
+        with fetch_engine.refresh_cycle():
+            result = {
+                'tech': get_cached_or_scrape('tech', get_all_tech_news, force_refresh),
+                'education': get_cached_or_scrape('education', get_all_education_news, force_refresh),
+                'career': get_cached_or_scrape('career', get_career_news, force_refresh),
+                'ai_ml': get_cached_or_scrape('ai_ml', get_ai_ml_news, force_refresh),
+                'startups': get_cached_or_scrape('startups', get_startup_news, force_refresh),
+                'general': get_cached_or_scrape('general', get_general_trends, force_refresh),
+            }
         
-        return jsonify(result), 200
+        result = {category: page.items(category, articles) for category, articles in result.items()}
+        result['_cached'] = not force_refresh
+        return page.respond(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1373,9 +1104,10 @@ def get_all_trends():
 def get_tech_trends():
     """Get technology news from multiple sources (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     try:
         articles = get_cached_or_scrape('tech', get_all_tech_news, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items('tech', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1383,9 +1115,10 @@ def get_tech_trends():
 def get_education_trends():
     """Get education news (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     try:
         articles = get_cached_or_scrape('education', get_all_education_news, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items('education', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1393,9 +1126,10 @@ def get_education_trends():
 def get_career_trends():
     """Get career and job-related news (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     try:
         articles = get_cached_or_scrape('career', get_career_news, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items('career', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1403,9 +1137,10 @@ def get_career_trends():
 def get_ai_trends():
     """Get AI and Machine Learning news (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     try:
         articles = get_cached_or_scrape('ai_ml', get_ai_ml_news, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items('ai_ml', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1413,9 +1148,10 @@ def get_ai_trends():
 def get_startup_trends():
     """Get startup and entrepreneurship news (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     try:
         articles = get_cached_or_scrape('startups', get_startup_news, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items('startups', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1423,9 +1159,10 @@ def get_startup_trends():
 def get_developer_trends():
     """Get developer-focused content (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     try:
         articles = get_cached_or_scrape('developer', get_developer_content, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items('developer', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1433,45 +1170,50 @@ def get_developer_trends():
 def get_github_trends():
     """Get GitHub trending repositories (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     try:
         articles = get_cached_or_scrape('github', scrape_github_trending, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items('github', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @news_bp.route('/api/trends/hackernews', methods=['GET'])
 def get_hackernews():
     """Get Hacker News top stories"""
+    page = page_request()
     try:
-        articles = scrape_hackernews()
-        return jsonify(articles), 200
+        articles = scrape_source("HackerNews")
+        return page.respond(page.items('hackernews', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @news_bp.route('/api/trends/reddit/<subreddit>', methods=['GET'])
 def get_reddit_trends(subreddit):
     """Get Reddit posts from a specific subreddit"""
+    page = page_request()
     try:
         articles = scrape_reddit(subreddit, 15)
-        return jsonify(articles), 200
+        return page.respond(page.items('reddit', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @news_bp.route('/api/trends/producthunt', methods=['GET'])
 def get_producthunt():
     """Get Product Hunt trending products"""
+    page = page_request()
     try:
-        articles = scrape_producthunt()
-        return jsonify(articles), 200
+        articles = scrape_source("ProductHunt")
+        return page.respond(page.items('producthunt', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @news_bp.route('/api/trends/medium/<tag>', methods=['GET'])
 def get_medium_articles(tag):
     """Get Medium articles by tag"""
+    page = page_request()
     try:
         articles = scrape_medium_tags(tag)
-        return jsonify(articles), 200
+        return page.respond(page.items('medium', articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1479,7 +1221,8 @@ def get_medium_articles(tag):
 def search_news():
     """Search for specific news topics with refined results"""
     query = request.args.get('q', 'technology')
-    limit = request.args.get('limit', 15, type=int)
+    page = page_request()
+    limit = page.limit if page.paginated else 15
     
     # Enhance the query for better results
     enhanced_queries = [
@@ -1489,26 +1232,12 @@ def search_news():
     ]
     
     try:
-        all_articles = []
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = [executor.submit(scrape_google_news, q, limit // 3 + 2) for q in enhanced_queries]
-            for future in futures:
-                try:
-                    articles = future.result(timeout=10)
-                    all_articles.extend(articles)
-                except:
-                    pass
-        
-        # Remove duplicates
-        seen_titles = set()
-        unique_articles = []
-        for article in all_articles:
-            title_key = article['title'].lower()[:50]
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_articles.append(article)
+        jobs = [google_news_source("Google-Search", q, limit // 3 + 2).job(name=q) for q in enhanced_queries]
+        all_articles = collect_articles("search_news", jobs, timeout=10, deadline=10)
         
-        return jsonify(unique_articles[:limit]), 200
+        if not page.paginated:
+            all_articles = all_articles[:limit]
+        return page.respond(page.items('search', all_articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1516,6 +1245,7 @@ def search_news():
 def get_category_news(category):
     """Get news by predefined category with optimized queries (cached)"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+    page = page_request()
     
     category_handlers = {
         'tech': ('tech', get_all_tech_news),
@@ -1540,7 +1270,7 @@ def get_category_news(category):
     
     try:
         articles = get_cached_or_scrape(cache_key, handler, force_refresh)
-        return jsonify(articles), 200
+        return page.respond(page.items(cache_key, articles))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1590,6 +1320,7 @@ def get_available_sources():
             'technology', 'programming', 'artificial-intelligence',
             'startup', 'career', 'productivity', 'javascript', 'python'
         ],
+        'registry': source_registry.describe(),
         'playwright_status': 'available' if PLAYWRIGHT_AVAILABLE else 'not installed'
     }
     return jsonify(sources), 200
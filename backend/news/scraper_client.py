@@ -2,27 +2,107 @@
 Scraper Service Client - Calls the HuggingFace Spaces Playwright scraper
 """
 import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Dict, List, Tuple
+
 import requests
-from typing import Optional, Dict, List
+
+from .http_client import http_get, http_post
+from .source_health import source_health, SourceUnavailable
 
 # HF Spaces Playwright scraper URL - set this in Render environment variables
 SCRAPER_SERVICE_URL = os.getenv("SCRAPER_SERVICE_URL", "https://parthnuwal7-prashikshan.hf.space")
 SCRAPER_API_KEY = os.getenv("SCRAPER_API_KEY", "123456")
 
-def is_scraper_available() -> bool:
-    """Check if the scraper service is configured and available"""
+# Circuit breaker key: while the Space is asleep or down, calls fail fast
+SERVICE_HEALTH_KEY = "HF Space"
+
+# How long a health check result is trusted before it's refreshed in the background
+HEALTH_TTL = int(os.getenv("SCRAPER_HEALTH_TTL", "120"))
+
+# OG image lookups are grouped into /scrape/batch calls (the service takes at
+# most 10 URLs per call), with at most MAX_IN_FLIGHT_BATCHES calls at once
+BATCH_SIZE = min(10, int(os.getenv("SCRAPER_BATCH_SIZE", "10")))
+MAX_IN_FLIGHT_BATCHES = int(os.getenv("SCRAPER_MAX_IN_FLIGHT_BATCHES", "2"))
+BATCH_LINGER = 0.2  # seconds to wait for more URLs before sending a partial batch
+
+# Last known availability - updated by health checks and by every service call
+_availability = {"available": None, "checked_at": 0.0, "refreshing": False}
+_availability_lock = threading.Lock()
+
+def _set_available(available: bool):
+    with _availability_lock:
+        _availability["available"] = available
+        _availability["checked_at"] = time.time()
+
+def _service_call(send, path: str, **kwargs) -> requests.Response:
+    """Call the scraper service through its circuit breaker"""
+    if not source_health.allow(SERVICE_HEALTH_KEY):
+        raise SourceUnavailable(SERVICE_HEALTH_KEY)
+    started = time.monotonic()
+    ok = False
+    try:
+        response = send(f"{SCRAPER_SERVICE_URL}{path}", **kwargs)
+        ok = response.status_code < 500
+        return response
+    finally:
+        source_health.record(SERVICE_HEALTH_KEY, ok, time.monotonic() - started)
+        _set_available(ok)
+
+def check_scraper_health() -> bool:
+    """Blocking /health probe of the scraper service (updates the cached state)"""
     if not SCRAPER_SERVICE_URL:
         print("[Scraper Client] Service URL not configured")
         return False
     try:
         print(f"[Scraper Client] Checking HF Spaces availability: {SCRAPER_SERVICE_URL}")
-        response = requests.get(f"{SCRAPER_SERVICE_URL}/health", timeout=10)
+        response = _service_call(http_get, "/health", timeout=10)
         available = response.status_code == 200
         print(f"[Scraper Client] HF Spaces available: {available}")
-        return available
     except Exception as e:
         print(f"[Scraper Client] HF Spaces not available: {e}")
+        available = False
+    _set_available(available)
+    return available
+
+def _refresh_availability():
+    try:
+        check_scraper_health()
+    finally:
+        with _availability_lock:
+            _availability["refreshing"] = False
+
+def is_scraper_available() -> bool:
+    """Check if the scraper service is configured and available.
+
+    Answers from the cached state; only the very first call waits on a health
+    check. Once the state is older than SCRAPER_HEALTH_TTL it is refreshed on
+    a background thread while callers keep getting the last known answer.
+    """
+    if not SCRAPER_SERVICE_URL:
         return False
+    with _availability_lock:
+        available = _availability["available"]
+        stale = time.time() - _availability["checked_at"] > HEALTH_TTL
+        if available is not None and stale and not _availability["refreshing"]:
+            _availability["refreshing"] = True
+            threading.Thread(target=_refresh_availability, name='scraper-health', daemon=True).start()
+    if available is None:
+        return check_scraper_health()
+    return available
+
+def get_availability() -> Dict:
+    """Cached service state for the admin panel"""
+    with _availability_lock:
+        checked_at = _availability["checked_at"]
+        return {
+            "configured": bool(SCRAPER_SERVICE_URL),
+            "available": _availability["available"],
+            "age_seconds": round(time.time() - checked_at, 1) if checked_at else None,
+            "refreshing": _availability["refreshing"],
+        }
 
 def scrape_url_with_playwright(url: str, wait_selector: str = None, timeout: int = 30000) -> Optional[Dict]:
     """Scrape a URL using the Playwright service"""
@@ -31,8 +111,8 @@ def scrape_url_with_playwright(url: str, wait_selector: str = None, timeout: int
         return None
     
     try:
-        response = requests.post(
-            f"{SCRAPER_SERVICE_URL}/scrape",
+        response = _service_call(
+            http_post, "/scrape",
             headers={"X-API-Key": SCRAPER_API_KEY},
             json={
                 "url": url,
@@ -51,27 +131,11 @@ def scrape_url_with_playwright(url: str, wait_selector: str = None, timeout: int
         print(f"[Scraper] Request failed: {e}")
         return None
 
-def get_og_image_with_playwright(url: str) -> Optional[str]:
+def get_og_image_with_playwright(url: str, timeout: float = 20) -> Optional[str]:
     """Get Open Graph image from a URL using Playwright"""
     if not SCRAPER_SERVICE_URL:
         return None
-    
-    try:
-        response = requests.post(
-            f"{SCRAPER_SERVICE_URL}/scrape/og-image",
-            headers={"X-API-Key": SCRAPER_API_KEY},
-            json={"url": url},
-            timeout=20
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success"):
-                return data.get("image")
-        return None
-    except Exception as e:
-        print(f"[Scraper Client] OG image request failed: {e}")
-        return None
+    return og_image_client.resolve_many([url], timeout=timeout).get(url)
 
 def scrape_news_source(source: str) -> List[Dict]:
     """Scrape news from a specific source using Playwright"""
@@ -81,8 +145,8 @@ def scrape_news_source(source: str) -> List[Dict]:
     
     try:
         print(f"[Scraper Client] Calling HF Spaces for source: {source}")
-        response = requests.get(
-            f"{SCRAPER_SERVICE_URL}/scrape/news/{source}",
+        response = _service_call(
+            http_get, f"/scrape/news/{source}",
             headers={"X-API-Key": SCRAPER_API_KEY},
             timeout=90  # Increased timeout for Playwright
         )
@@ -111,8 +175,8 @@ def batch_scrape_urls(urls: List[str]) -> List[Dict]:
         return []
     
     try:
-        response = requests.post(
-            f"{SCRAPER_SERVICE_URL}/scrape/batch",
+        response = _service_call(
+            http_post, "/scrape/batch",
             headers={"X-API-Key": SCRAPER_API_KEY},
             json={"urls": urls[:10]},  # Limit to 10
             timeout=120
@@ -125,3 +189,174 @@ def batch_scrape_urls(urls: List[str]) -> List[Dict]:
     except Exception as e:
         print(f"[Scraper] Batch scrape failed: {e}")
         return []
+
+def _fetch_og_image(url: str) -> Optional[str]:
+    """POST /scrape/og-image; raises when the service fails so callers can tell it from 'no image'"""
+    response = _service_call(
+        http_post, "/scrape/og-image",
+        headers={"X-API-Key": SCRAPER_API_KEY},
+        json={"url": url},
+        timeout=20
+    )
+    if response.status_code == 429 or response.status_code >= 500:
+        response.raise_for_status()
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    return data.get("image") if data.get("success") else None
+
+def _batch_answer(result) -> Tuple[bool, Optional[str]]:
+    """(answered, image) for one /scrape/batch result.
+
+    Only a successful result carrying the `image` field of /scrape/og-image
+    answers for its URL; anything else is looked up on its own.
+    """
+    if not isinstance(result, dict) or not result.get("success") or "image" not in result:
+        return False, None
+    return True, result.get("image") or None
+
+
+class OGImageClient:
+    """Collects page URLs from any thread and resolves their OG images through
+    batch_scrape_urls, BATCH_SIZE URLs per call and at most
+    MAX_IN_FLIGHT_BATCHES calls at once. Concurrent requests for the same URL
+    share one slot.
+
+    URLs a batch does not answer (failed call, result without an image) go
+    through /scrape/og-image one by one on the same slot. If the batch results
+    never carry an image at all, later lookups skip batching.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE, max_in_flight: int = MAX_IN_FLIGHT_BATCHES,
+                 linger: float = BATCH_LINGER):
+        self._batch_size = batch_size
+        self._max_in_flight = max_in_flight
+        self._linger = linger
+        self._cond = threading.Condition()
+        self._pending = []   # [(url, future)] not yet sent
+        self._waiting = {}   # url -> future, until its batch finishes
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pool = None
+        self._dispatcher = None
+        self._batching = True
+        self._batches_sent = 0
+        self._urls_sent = 0
+        self._single_requests = 0
+        self._images_found = 0
+
+    def submit(self, url: str) -> Future:
+        """Future for one URL's image (None = page has no image; exception = call failed)"""
+        with self._cond:
+            future = self._waiting.get(url)
+            if future is not None:
+                return future
+            future = Future()
+            self._waiting[url] = future
+            self._pending.append((url, future))
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._pool = ThreadPoolExecutor(max_workers=self._max_in_flight, thread_name_prefix='og-batch')
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name='og-batcher', daemon=True)
+                self._dispatcher.start()
+            self._cond.notify()
+            return future
+
+    def resolve_many(self, urls: List[str], timeout: float = None) -> Dict[str, Optional[str]]:
+        """url -> image for every URL whose lookup finished within `timeout`.
+
+        Failed or unfinished URLs are left out; skipped entirely while the
+        service is unavailable.
+        """
+        if not urls or not is_scraper_available():
+            return {}
+        futures = {url: self.submit(url) for url in dict.fromkeys(urls)}
+        wait(list(futures.values()), timeout=timeout)
+        return {url: future.result() for url, future in futures.items()
+                if future.done() and not future.exception()}
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Give callers submitting together a moment to fill the batch
+                size = self._batch_size if self._batching else 1
+                deadline = time.monotonic() + self._linger
+                while len(self._pending) < size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:size]
+                del self._pending[:size]
+            self._slots.acquire()  # bounds the calls in flight
+            self._pool.submit(self._send, batch)
+
+    def _answers(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """url -> image for the URLs one batch call answered"""
+        results = batch_scrape_urls(urls)
+        by_url = {r.get("url"): r for r in results if isinstance(r, dict) and r.get("url")}
+        answers = {}
+        for index, url in enumerate(urls):
+            # Match results by URL, falling back to request order
+            result = by_url.get(url) or (results[index] if not by_url and index < len(results) else None)
+            answered, image = _batch_answer(result)
+            if answered:
+                answers[url] = image
+        if results and not any(isinstance(r, dict) and "image" in r for r in results):
+            with self._cond:
+                if self._batching:
+                    print("[Scraper Client] /scrape/batch results carry no image, using /scrape/og-image")
+                self._batching = False
+        return answers
+
+    def _send(self, batch: List[tuple]):
+        urls = [url for url, _ in batch]
+        try:
+            answers = self._answers(urls) if len(urls) > 1 else {}
+            for url, future in batch:
+                if url in answers:
+                    future.set_result(answers[url])
+                    continue
+                try:
+                    future.set_result(_fetch_og_image(url))
+                except Exception as e:
+                    print(f"[Scraper Client] OG image request failed for {url}: {e}")
+                    future.set_exception(e)
+                finally:
+                    with self._cond:
+                        self._single_requests += 1
+            found = sum(1 for _, f in batch if not f.exception() and f.result())
+            if len(urls) > 1:
+                print(f"[Scraper Client] OG batch of {len(urls)} done ({len(answers)} answered by the batch), "
+                      f"{found} images")
+        except Exception as e:
+            print(f"[Scraper Client] OG batch of {len(urls)} failed: {e}")
+            found = 0
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            with self._cond:
+                if len(urls) > 1:
+                    self._batches_sent += 1
+                    self._urls_sent += len(urls)
+                self._images_found += found
+                for url in urls:
+                    self._waiting.pop(url, None)
+            self._slots.release()
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "waiting": len(self._waiting),
+                "batching": self._batching,
+                "batches_sent": self._batches_sent,
+                "urls_sent": self._urls_sent,
+                "single_requests": self._single_requests,
+                "images_found": self._images_found,
+            }
+
+
+# Global OG image client instance
+og_image_client = OGImageClient()
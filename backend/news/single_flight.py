@@ -0,0 +1,137 @@
+"""
+Single Flight - One scrape per key at a time: concurrent callers in a process
+share the leader's result, and a file lease keeps other worker processes out
+"""
+import os
+import time
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from .fetch_engine import fetch_engine
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: in-process coalescing only
+    fcntl = None
+
+LOCK_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache', 'locks')
+# How long a worker waits for another worker's scrape before doing its own
+LEASE_WAIT = float(os.getenv("SINGLE_FLIGHT_LEASE_WAIT", "30"))
+LEASE_POLL = 0.2
+
+
+def _budget(limit: float = None) -> Optional[float]:
+    """Seconds the caller may still wait: what is left of its fetch_engine.deadline()
+    block (capped at `limit`), or `limit` outside one"""
+    left = fetch_engine.time_left()
+    if left is None:
+        return limit
+    left = max(left, 0)
+    return left if limit is None else min(left, limit)
+
+
+class SingleFlight:
+    """Coalesces calls by key (e.g. "category:tech").
+
+    do() runs `fn` in the first caller only; callers arriving while it runs
+    wait and get the same result (or exception). The leader also takes an
+    flock on cache/locks/<key>.lock - if another process holds it, the
+    leader waits for that process and asks `reuse()` whether its result
+    (now on disk) can be used instead of calling `fn`.
+
+    Both waits come out of the caller's fetch_engine.deadline() budget: a
+    follower still waiting when it runs out gets a TimeoutError, and a
+    leader stops waiting for the lease (its own `fn` then runs under the
+    same, nearly spent deadline).
+    """
+
+    def __init__(self, lock_dir: str = LOCK_DIR, lease_wait: float = LEASE_WAIT):
+        self._lock_dir = lock_dir
+        self._lease_wait = lease_wait
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future of the running call
+        self._leaders = 0
+        self._shared = 0
+        self._lease_waits = 0
+        self._reused = 0
+
+    def do(self, key: str, fn: Callable[[], Any], reuse: Callable[[], Any] = None) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._leaders += 1
+            else:
+                self._shared += 1
+        if not leader:
+            return future.result(timeout=_budget())
+
+        try:
+            with self._lease(key) as waited:
+                result = reuse() if waited and reuse else None
+                if result is not None:
+                    with self._lock:
+                        self._reused += 1
+                else:
+                    result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    @contextmanager
+    def _lease(self, key: str):
+        """Exclusive cross-process lease; yields True if another process held it first"""
+        if fcntl is None:
+            yield False
+            return
+        os.makedirs(self._lock_dir, exist_ok=True)
+        path = os.path.join(self._lock_dir, f"{key.replace(':', '_').replace('/', '_')}.lock")
+        with open(path, 'a') as lock_file:
+            waited = False
+            deadline = time.monotonic() + _budget(self._lease_wait)
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if not waited:
+                        waited = True
+                        with self._lock:
+                            self._lease_waits += 1
+                        print(f"[Single Flight] {key} held by another worker, waiting")
+                    if time.monotonic() >= deadline:
+                        # The other worker is taking too long; go ahead without the lease
+                        print(f"[Single Flight] {key} lease wait timed out, proceeding")
+                        yield waited
+                        return
+                    time.sleep(LEASE_POLL)
+            try:
+                yield waited
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "in_flight": sorted(self._calls),
+                "leaders": self._leaders,
+                "shared": self._shared,
+                "lease_waits": self._lease_waits,
+                "reused_from_other_worker": self._reused,
+            }
+
+
+# Global single-flight instance
+single_flight = SingleFlight()
@@ -0,0 +1,175 @@
+"""
+Source Health - Per-source circuit breakers, rolling success rate / latency
+percentiles, and time budgets derived from observed latency
+"""
+import os
+import math
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+# Consecutive failures that open a source's breaker
+FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+# Breaker also opens when the success rate over the recent window drops below this
+MIN_SUCCESS_RATE = float(os.getenv("BREAKER_MIN_SUCCESS_RATE", "0.5"))
+# First cooldown before a half-open probe; doubles on every failed probe
+COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+MAX_COOLDOWN = float(os.getenv("BREAKER_MAX_COOLDOWN", "600"))
+# Outcomes kept per source for success rate and percentiles
+WINDOW = int(os.getenv("SOURCE_HEALTH_WINDOW", "50"))
+MIN_RATE_SAMPLES = 10
+# Adaptive budget: p95 of successful calls x factor, never below the floor
+MIN_LATENCY_SAMPLES = 5
+TIMEOUT_P95_FACTOR = float(os.getenv("SOURCE_TIMEOUT_P95_FACTOR", "2.0"))
+MIN_TIMEOUT = float(os.getenv("SOURCE_MIN_TIMEOUT", "3"))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class SourceUnavailable(Exception):
+    """Raised instead of calling a source whose breaker is open"""
+
+    def __init__(self, key: str):
+        super().__init__(f"{key} circuit open, skipping")
+        self.key = key
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class _Breaker:
+    def __init__(self):
+        self.outcomes = deque(maxlen=WINDOW)  # (ok, latency)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = COOLDOWN
+        self.opened_at = 0.0
+        self.probe_started = None
+        self.opens = 0
+        self.skipped = 0
+
+    def latencies(self) -> List[float]:
+        return [latency for ok, latency in self.outcomes if ok]
+
+    def success_rate(self) -> Optional[float]:
+        if not self.outcomes:
+            return None
+        return sum(1 for ok, _ in self.outcomes if ok) / len(self.outcomes)
+
+
+class SourceHealth:
+    """Tracks every source by key; callers ask allow() first and record() after"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def _get(self, key: str) -> _Breaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = _Breaker()
+        return breaker
+
+    def allow(self, key: str) -> bool:
+        """False while the breaker is open; lets one probe through once it cools down"""
+        now = time.time()
+        with self._lock:
+            breaker = self._get(key)
+            if breaker.state == CLOSED:
+                return True
+            if now - breaker.opened_at < breaker.cooldown:
+                breaker.skipped += 1
+                return False
+            # Half-open: one probe at a time (a lost probe is retried after a cooldown)
+            if breaker.probe_started is not None and now - breaker.probe_started < breaker.cooldown:
+                breaker.skipped += 1
+                return False
+            breaker.state = HALF_OPEN
+            breaker.probe_started = now
+            return True
+
+    def record(self, key: str, ok: bool, latency: float):
+        """Outcome of one call to the source"""
+        now = time.time()
+        with self._lock:
+            breaker = self._get(key)
+            breaker.outcomes.append((ok, latency))
+
+            if ok:
+                if breaker.state != CLOSED:
+                    print(f"[Source Health] {key} recovered, closing breaker")
+                    # Start the success rate over so old failures don't re-trip it
+                    breaker.outcomes.clear()
+                    breaker.outcomes.append((ok, latency))
+                breaker.state = CLOSED
+                breaker.consecutive_failures = 0
+                breaker.cooldown = COOLDOWN
+                breaker.probe_started = None
+                return
+
+            breaker.consecutive_failures += 1
+            if breaker.state == HALF_OPEN:
+                breaker.cooldown = min(breaker.cooldown * 2, MAX_COOLDOWN)
+                self._open(key, breaker, now, "probe failed")
+                return
+            rate = breaker.success_rate()
+            if breaker.state == CLOSED and (
+                    breaker.consecutive_failures >= FAILURE_THRESHOLD
+                    or (len(breaker.outcomes) >= MIN_RATE_SAMPLES and rate < MIN_SUCCESS_RATE)):
+                self._open(key, breaker, now, f"{breaker.consecutive_failures} failures in a row, "
+                                              f"success rate {rate:.0%}")
+
+    @staticmethod
+    def _open(key: str, breaker: _Breaker, now: float, reason: str):
+        breaker.state = OPEN
+        breaker.opened_at = now
+        breaker.probe_started = None
+        breaker.opens += 1
+        print(f"[Source Health] {key} breaker OPEN ({reason}), retrying in {breaker.cooldown:.0f}s")
+
+    def timeout_for(self, key: str, ceiling: float) -> float:
+        """Budget for the next call: p95 of recent successes x factor, capped at `ceiling`"""
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None or breaker.state != CLOSED:
+                return ceiling
+            latencies = breaker.latencies()
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return ceiling
+        return round(min(ceiling, max(MIN_TIMEOUT, _percentile(latencies, 95) * TIMEOUT_P95_FACTOR)), 2)
+
+    def get_stats(self) -> Dict:
+        """Per-source state for the admin panel"""
+        now = time.time()
+        with self._lock:
+            stats = {}
+            for key, breaker in sorted(self._breakers.items()):
+                latencies = breaker.latencies()
+                rate = breaker.success_rate()
+                p50 = _percentile(latencies, 50)
+                p95 = _percentile(latencies, 95)
+                stats[key] = {
+                    "state": breaker.state,
+                    "samples": len(breaker.outcomes),
+                    "success_rate": round(rate, 3) if rate is not None else None,
+                    "latency_p50": round(p50, 3) if p50 is not None else None,
+                    "latency_p95": round(p95, 3) if p95 is not None else None,
+                    "consecutive_failures": breaker.consecutive_failures,
+                    "opens": breaker.opens,
+                    "skipped": breaker.skipped,
+                    "retry_in": round(max(0.0, breaker.opened_at + breaker.cooldown - now), 1)
+                                if breaker.state != CLOSED else None,
+                }
+            return stats
+
+
+# Global source health instance
+source_health = SourceHealth()
@@ -0,0 +1,111 @@
+"""
+Source Registry - Every news source declared once (URL, parser, category,
+item limit, time budget, per-host concurrency) and scheduled on the fetch engine
+"""
+import os
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from .fetch_engine import fetch_engine, FetchJob
+from .http_client import parse_host_sizes
+from .source_health import source_health
+
+# Budget for a source that doesn't declare one (seconds, fetch + parse)
+DEFAULT_SOURCE_TIMEOUT = 10
+
+# Per-host caps from the environment win over the declared ones
+# (e.g. SOURCE_HOST_CONCURRENCY="www.reddit.com=1,news.google.com=12")
+HOST_CONCURRENCY_OVERRIDES = parse_host_sizes(os.getenv("SOURCE_HOST_CONCURRENCY", ""))
+
+
+class Source:
+    """One news source.
+
+    URL sources are fetched by the engine and parsed with
+    `parse(response, *args, limit=limit)`; sources without a URL run
+    `parse(*args, limit=limit)` as a task that drives its own fetches. The
+    engine keeps at most `limit` items of the result, and a `{limit}` in the
+    URL is filled in too, for APIs that take a page size. `groups` are the aggregated feeds (cache categories) the source
+    feeds into, `timeout` is its whole budget (the ceiling - once the source
+    has a latency history the budget shrinks towards its observed p95) and
+    `host_concurrency` caps how many of its host's requests may be in flight.
+    """
+
+    def __init__(self, name: str, parse: Callable, url: str = None, args: tuple = (),
+                 category: str = 'general', limit: int = None, timeout: float = DEFAULT_SOURCE_TIMEOUT,
+                 groups: Sequence[str] = (), request_kwargs: Dict = None, conditional: bool = False,
+                 host: str = None, host_concurrency: int = None):
+        self.name = name
+        self.parse = parse
+        self.url = url.replace('{limit}', str(limit)) if url and limit is not None else url
+        self.args = tuple(args)
+        self.category = category
+        self.limit = limit
+        self.timeout = timeout
+        self.groups = tuple(groups)
+        self.request_kwargs = request_kwargs or {}
+        self.conditional = conditional
+        self.host = host or (urlparse(url).netloc if url else None)
+        self.host_concurrency = host_concurrency
+
+    def __repr__(self):
+        return f"Source({self.name!r}, url={self.url!r})"
+
+    def job(self, name: str = None) -> FetchJob:
+        """Fetch engine job for this source, bounded by its (adaptive) budget"""
+        timeout = source_health.timeout_for(self.name, self.timeout)
+        request_kwargs = self.request_kwargs
+        if self.url:
+            request_kwargs = {**request_kwargs, 'timeout': timeout}
+        return FetchJob(name or self.name, self.parse, url=self.url, args=self.args, timeout=timeout,
+                        request_kwargs=request_kwargs, conditional=self.conditional, health_key=self.name,
+                        limit=self.limit)
+
+    def describe(self) -> Dict:
+        return {
+            'name': self.name,
+            'url': self.url,
+            'host': self.host,
+            'category': self.category,
+            'limit': self.limit,
+            'timeout': self.timeout,
+            'current_timeout': source_health.timeout_for(self.name, self.timeout),
+            'groups': list(self.groups),
+        }
+
+
+class SourceRegistry:
+    """Named sources in declaration order; aggregators ask for a group's jobs"""
+
+    def __init__(self):
+        self._sources = {}
+
+    def register(self, *sources: Source):
+        for source in sources:
+            if source.name in self._sources:
+                raise ValueError(f"Source already registered: {source.name}")
+            self._sources[source.name] = source
+            limit = HOST_CONCURRENCY_OVERRIDES.get(source.host, source.host_concurrency)
+            if source.host and limit:
+                fetch_engine.set_host_limit(source.host, limit)
+
+    def get(self, name: str) -> Optional[Source]:
+        return self._sources.get(name)
+
+    def group(self, group: str) -> List[Source]:
+        """Sources feeding one aggregated feed"""
+        return [source for source in self._sources.values() if group in source.groups]
+
+    def jobs(self, group: str) -> List[FetchJob]:
+        """Engine jobs for every source in a group"""
+        return [source.job() for source in self.group(group)]
+
+    def groups(self) -> List[str]:
+        return list(dict.fromkeys(g for source in self._sources.values() for g in source.groups))
+
+    def describe(self) -> List[Dict]:
+        return [source.describe() for source in self._sources.values()]
+
+
+# Global source registry (sources are declared in scraper.py next to their parsers)
+source_registry = SourceRegistry()